@@ -7,16 +7,24 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # ==================== IMPORTS ====================
-from fastapi import FastAPI, WebSocket, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import json
 import asyncio
 import csv
+import itertools
+import logging
+import threading
+from collections import deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import List
 
+from src.scrapers.base_scraper import build_session, format_ts
+from src.scrapers.crypto_scraper import format_record
+from src.utils import json_utils
+
 # Import your existing code
 try:
     from src.agents.research_agent import ResearchAgent
@@ -25,22 +33,41 @@ except ImportError as e:
     ResearchAgent = None
 
 # ==================== SETUP ====================
-app = FastAPI(title="Research Agent API")
+
+# The app owns logging setup; library modules only create loggers
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    #One pooled, retrying HTTP session shared by every agent's scrapers, closed on shutdown
+    session = build_session()
+    app.state.http = session
+    try:
+        yield
+    finally:
+        app.state.http = None
+        session.close()
+
+app = FastAPI(title="Research Agent API", lifespan=lifespan)
 
 # CORS configuration
+# Only the methods/headers the frontend uses; browsers cache preflights for an hour
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["content-type"],
+    max_age=3600,
 )
 
 # Storage
-RESEARCH_HISTORY = []
-RESULTS_DIR = "results"
-if not os.path.exists(RESULTS_DIR):
-    os.makedirs(RESULTS_DIR)
+MAX_HISTORY = int(os.getenv("MAX_HISTORY", "10000"))
+
+# Agents kept warm between queries
+AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "4"))
 
 # ==================== DATA MODELS ====================
 
@@ -48,28 +75,168 @@ class ResearchRequest(BaseModel):
     query: str
     priority: str = "normal"
 
+class ResultStore:
+    #Bounded research history: deque keeps insertion order, dict index gives O(1) lookups by id
+    #Kept per process - with several uvicorn workers each worker has its own history
+    
+    def __init__(self, max_size: int = MAX_HISTORY):
+        self._history = deque(maxlen=max_size)
+        self._index = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+    
+    def add(self, entry: dict) -> int:
+        #Store a new result, assign it an id and drop the oldest one when full
+        with self._lock:
+            if len(self._history) == self._history.maxlen:
+                oldest = self._history[0]
+                self._index.pop(oldest["id"], None)
+            
+            entry["id"] = next(self._ids)
+            self._history.append(entry)
+            self._index[entry["id"]] = entry
+            return entry["id"]
+    
+    def get(self, result_id: int):
+        return self._index.get(result_id)
+    
+    def remove(self, result_id: int) -> bool:
+        with self._lock:
+            entry = self._index.pop(result_id, None)
+            if entry is None:
+                return False
+            self._history.remove(entry)
+            return True
+    
+    def recent(self, limit: int) -> list:
+        #Newest first
+        with self._lock:
+            return list(itertools.islice(reversed(self._history), max(limit, 0)))
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._history.clear()
+            self._index.clear()
+    
+    def __len__(self) -> int:
+        return len(self._history)
+
+STORE = ResultStore()
+
+class AgentPool:
+    #Reuses agents across queries instead of building a new one (and its scrapers) per message
+    #Each agent serves one query at a time; under load extra agents are built on demand
+    
+    def __init__(self, factory, max_idle: int = AGENT_POOL_SIZE):
+        self._factory = factory
+        self._idle = deque()
+        self._max_idle = max_idle
+    
+    def acquire(self):
+        try:
+            return self._idle.pop()
+        except IndexError:
+            return self._factory()
+    
+    def release(self, agent) -> None:
+        #Clear per-query state and keep the agent for the next query
+        agent.reset()
+        if len(self._idle) < self._max_idle:
+            self._idle.append(agent)
+
+def _new_agent():
+    #Agents built while the app is running share the lifespan's HTTP session
+    return ResearchAgent(session=getattr(app.state, "http", None))
+
+AGENT_POOL = AgentPool(_new_agent)
+
+class _EchoBuffer:
+    #File-like object for csv.writer: writerow() returns the formatted line instead of buffering it
+    def write(self, value):
+        return value
+
+# ==================== HELPERS ====================
+
+async def _receive_json(websocket: WebSocket):
+    #Parse the frame payload directly (text or binary), skipping receive_text's extra decode step
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    return json_utils.loads(message.get("bytes") or message.get("text") or "")
+
+async def _send(websocket: WebSocket, message: dict) -> None:
+    #Serialize with orjson (when installed) and send as a text frame, which the browser JSON.parse()s
+    await websocket.send_text(json_utils.dumps(message).decode("utf-8"))
+
+def _for_display(value):
+    #Copy of a research result formatted for the UI (scrapers keep raw numbers):
+    #price records via format_record, epoch-ns scraped_at_ns as an ISO scraped_at
+    #(browsers can't hold ints above 2**53 exactly)
+    if isinstance(value, dict):
+        if "crypto_id" in value:
+            return format_record(value)
+        display = {key: _for_display(item) for key, item in value.items() if key != "scraped_at_ns"}
+        if "scraped_at_ns" in value:
+            display["scraped_at"] = format_ts(value["scraped_at_ns"])
+        return display
+    if isinstance(value, list):
+        return [_for_display(item) for item in value]
+    return value
+
+async def _run_with_progress(websocket: WebSocket, agent, query: str):
+    #Run the agent off the event loop and stream its events to the client as progress messages
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    
+    # The agent runs in worker threads, so hand events back to the loop thread-safely
+    agent.on_event = lambda event: loop.call_soon_threadsafe(events.put_nowait, event)
+    
+    async def run():
+        try:
+            # ';'-separated sub-queries run concurrently
+            return await agent.run_async(query)
+        finally:
+            events.put_nowait(None)  # no more events
+    
+    run_task = asyncio.create_task(run())
+    try:
+        while (event := await events.get()) is not None:
+            message = {"status": "progress", "message": event["message"], "event": event}
+            if "task" in event:
+                message["task"] = event["task"]
+            if "tool_calls" in event:
+                message["tool_calls"] = event["tool_calls"]
+            await _send(websocket, message)
+        return await run_task
+    finally:
+        if not run_task.done():
+            # Sending failed (e.g. the client left) and the agent's worker thread can't be
+            # cancelled, so let it finish before the agent is reset and pooled again
+            await asyncio.gather(asyncio.shield(run_task), return_exceptions=True)
+        agent.on_event = None
+
 # ==================== ENDPOINTS ====================
 
 @app.get("/")
-def api_health_check():
+async def api_health_check():
     #Check if API is running
     return {"status": "Research Agent API is online!"}
 
 @app.get("/history")
-def get_history(limit: int = 10):
+async def get_history(limit: int = 10):
     #Get research history
     return {
-        "count": len(RESEARCH_HISTORY),
-        "history": RESEARCH_HISTORY[-limit:][::-1]
+        "count": len(STORE),
+        "history": STORE.recent(limit)
     }
 
 @app.get("/results/{result_id}")
-def get_result(result_id: int):
+async def get_result(result_id: int):
     #Get specific research result
-    for result in RESEARCH_HISTORY:
-        if result["id"] == result_id:
-            return result
-    raise HTTPException(status_code=404, detail="Result not found")
+    result = STORE.get(result_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Result not found")
+    return result
 
 @app.websocket("/ws/research")
 async def websocket_research(websocket: WebSocket):
@@ -79,62 +246,56 @@ async def websocket_research(websocket: WebSocket):
     try:
         while True:
             # Receive query from React
-            message = await websocket.receive_text()
-            request_data = json.loads(message)
+            try:
+                request_data = await _receive_json(websocket)
+            except json_utils.JSONDecodeError:
+                request_data = None
+            
+            if not isinstance(request_data, dict):
+                await _send(websocket, {
+                    "status": "error",
+                    "message": "Invalid JSON: expected an object like {\"query\": \"...\"}"
+                })
+                continue
+            
             query = request_data.get("query")
             
             if not query:
-                await websocket.send_json({
+                await _send(websocket, {
                     "status": "error",
                     "message": "Query is required"
                 })
                 continue
             
             # Send: Started
-            await websocket.send_json({
+            await _send(websocket, {
                 "status": "started",
                 "message": f"Starting research on: {query}"
             })
-            await asyncio.sleep(0.3)  # ← Add delay
             
             try:
                 if ResearchAgent is None:
                     raise Exception("ResearchAgent not imported")
                 
-                # Create agent
-                agent = ResearchAgent()
-                
-                # Send: In Progress
-                await websocket.send_json({
-                    "status": "progress",
-                    "message": "Searching the web..."
-                })
-                await asyncio.sleep(0.5)  # ← Add delay
-                # Run agent
-                results = agent.run(query)
-                memory = agent.memory.get_summary() if hasattr(agent, 'memory') else {}
-                
-                # More progress
-                await websocket.send_json({
-                    "status": "progress",
-                    "message": "Analyzing findings...",
-                    "tool_calls": memory.get("tool_calls", 0) if memory else 0
-                })
-                await asyncio.sleep(0.5)
+                # Borrow a warm agent for this query
+                agent = AGENT_POOL.acquire()
+                try:
+                    # Agent events are sent to the client as they happen
+                    results = _for_display(await _run_with_progress(websocket, agent, query))
+                    memory = agent.memory.get_summary()
+                finally:
+                    AGENT_POOL.release(agent)
                 
                 # Save result
-                result_id = len(RESEARCH_HISTORY) + 1
-                result_entry = {
-                    "id": result_id,
+                result_id = STORE.add({
                     "query": query,
                     "timestamp": datetime.now().isoformat(),
                     "findings": str(results),
                     "memory": memory
-                }
-                RESEARCH_HISTORY.append(result_entry)
+                })
                 
                 # Send: Completed
-                await websocket.send_json({
+                await _send(websocket, {
                     "status": "completed",
                     "message": "Research complete!",
                     "results": results,
@@ -143,7 +304,7 @@ async def websocket_research(websocket: WebSocket):
                 })
                 
             except Exception as e:
-                await websocket.send_json({
+                await _send(websocket, {
                     "status": "error",
                     "message": f"Research failed: {str(e)}"
                 })
@@ -155,48 +316,43 @@ async def websocket_research(websocket: WebSocket):
         await websocket.close()
 
 @app.post("/export/{result_id}")
-def export_result(result_id: int):
-    #Export research result as CSV
-    result = None
-    for r in RESEARCH_HISTORY:
-        if r["id"] == result_id:
-            result = r
-            break
-    
-    if not result:
+async def export_result(result_id: int):
+    #Export research result as CSV (streamed row by row, nothing written to disk)
+    result = STORE.get(result_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Result not found")
     
-    # Create CSV
-    filename = f"{RESULTS_DIR}/research_{result_id}.csv"
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(["Query", "Timestamp", "Findings"])
-        writer.writerow([result["query"], result["timestamp"], result["findings"]])
+    def rows():
+        writer = csv.writer(_EchoBuffer())
+        yield writer.writerow(["Query", "Timestamp", "Findings"])
+        yield writer.writerow([result["query"], result["timestamp"], result["findings"]])
     
-    return FileResponse(
-        filename,
+    return StreamingResponse(
+        rows(),
         media_type="text/csv",
-        filename=f"research_{result_id}.csv"
+        headers={"Content-Disposition": f"attachment; filename=research_{result_id}.csv"}
     )
 
 @app.delete("/results/{result_id}")
-def delete_result(result_id: int):
+async def delete_result(result_id: int):
     #Delete a research result
-    global RESEARCH_HISTORY
-    original_length = len(RESEARCH_HISTORY)
-    RESEARCH_HISTORY = [r for r in RESEARCH_HISTORY if r["id"] != result_id]
-    
-    if len(RESEARCH_HISTORY) == original_length:
+    if not STORE.remove(result_id):
         raise HTTPException(status_code=404, detail="Result not found")
     
-    # Delete CSV file if exists
-    filename = f"{RESULTS_DIR}/research_{result_id}.csv"
-    if os.path.exists(filename):
-        os.remove(filename)
-    
     return {"success": True, "message": f"Result {result_id} deleted"}
 
 # ==================== RUN ====================
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # loop/http "auto" pick uvloop + httptools when installed (uvicorn[standard]), else asyncio + h11.
+    # History and the agent pool live in each worker process, so WEB_CONCURRENCY > 1
+    # means a result saved by one worker is not visible to requests served by another.
+    uvicorn.run(
+        "backend.app:app",
+        app_dir=str(Path(__file__).parent.parent),
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+    )
\ No newline at end of file
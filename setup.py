@@ -15,5 +15,7 @@ setup(
         "openai>=1.3.0",
         "pydantic>=2.5.0",
         "pytest>=7.4.3",
+        "pytest-xdist>=3.5.0",
+        "pytest-randomly>=3.15.0",
     ],
 )
\ No newline at end of file
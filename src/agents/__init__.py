@@ -1,10 +1,28 @@
-from .base_agent import BaseAgent, Tool, Memory
-from .research_agent import ResearchAgent, DummyScraper
-
-__all__ = [
-    'BaseAgent',
-    'Tool',
-    'Memory',
-    'ResearchAgent',
-    'DummyScraper'
-]
\ No newline at end of file
+"""Agents module"""
+
+from importlib import import_module
+
+# Names are resolved on first access (PEP 562), so importing src.agents stays cheap
+# and only loads research_agent (and its scrapers) when it is actually used
+_EXPORTS = {
+    'BaseAgent': '.base_agent',
+    'Tool': '.base_agent',
+    'Memory': '.base_agent',
+    'HistoryEvent': '.base_agent',
+    'ResearchAgent': '.research_agent',
+    'DummyScraper': '.research_agent'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value  # cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
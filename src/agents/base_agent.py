@@ -1,231 +1,87 @@
-# #This is base agent class
-# #Foundation for all a.i agents it will act as the Parent class and other classes will inherit its basic functions
+# Base agent: the parent class all A.I agents inherit from.
+# Agents think, reason, and use tools to complete tasks.
 
-# # Agents think, reason, and use tools to complete tasks
-# from __future__ import annotations
-
-# import logging
-# from abc import ABC, abstractmethod
-# from typing import Any, Callable
-# from datetime import datetime
-
-# logger = logging.getLogger(__name__)
-
-# #TOOLS CLASS (what agents going to use)
-# class Tool:
-#     #like scrapeWebsiteTool, Analyze tool
-
-#     def __init__(
-#             #parameter of init function also the tools structure
-#             self, 
-#             name: str,
-#             description: str,
-#             function: Callable,
-#             parameter: dict = None
-#     ):
-#         self.name = name
-#         self.description = description
-#         self.function = function
-#         self.parameter = parameter or {}
-
-#         logger.info(f"Created Tool: {name}")
-
-#     def execute(self, **kwargs) -> Any:
-#         # execute to execute the tool given parameter
-#         #**kwargs: parameters to pass to function 
-
-#         try:
-#             logger.info(f"Executing tool: {self.name} with {kwargs}")
-#             result = self.function(**kwargs)
-#             logger.info(f"Tool {self.name} executed successfully") 
-#             return result
-        
-#         except Exception as e:
-#             logger.info(f"Error executing tool {self.name}: {e}")
-#             return f"Error: {str(e)}"
-
-#     def to_dict(self) -> dict:
-#         #Convert tool to dictionary format (For AI)
-#         #AI needs to understand tools in structured format
-
-#         return{
-#             'name': self.name,
-#             'description': self.description,
-#             'parameter': self.parameter
-#         }
-    
-# #AGENT MEMORY CLASS
-# class AgentMemory:
-#     #it stores what the agent has done and learned
-#     #WHY MEMORY?
-#     # Agent needs to remember:
-#     # - What tools it has called
-#     # - What results it got
-#     # - What the user asked
-#     # - What steps it took
-
-#     def __init__(self):
-#         #initialize empty memory
-#         self.history = []
-#         self.task = None
-#         self.tool_calls = []
-    
-#     def set_task(self, task: str) -> None:
-#         #stores the users task
-#         self.task = task
-#         self.history.append({
-#             'type': 'task',
-#             'content': 'task',
-#             'timestamp': datetime.now().isoformat()
-#         })
-#         logger.info(f"Agent Task: {task}")
-
-#     def add_thoughts(self, thought: str) ->None:
-#         #agent thinks some thing like when the user say get me latest news
-#         #agent thinks like: user wants news i should scrape website
-
-#         self.history.append({
-#             'type': 'thought',
-#             'content': 'thought',
-#             'timestamp': datetime.now().isoformat()
-#         })
-#         logger.info(f"Agent Thought: {thought}")
-
-#     def add_tool_call(self, tool_name: str, params:dict, result: Any) -> None:
-#         #Args:
-#             # tool_name: Name of tool called
-#             # params: Parameters passed
-#             # result: What the tool returned
-
-#             call = {
-#                 'tool': tool_name,
-#                 'parameters': params,
-#                 'result': result,
-#                 'timestamp': datetime.now().isoformat()
-#             }
-#             self.tool_calls.append(call)
-#             self.history.append({
-#                 'type': 'tool_call',
-#                 'content': call,
-#                 'timestamp': datetime.now().isoformat()
-#             })
+from __future__ import annotations
 
-#             logger.info(f"Tool called: {tool_name} -> {str(result)[:100]}")
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import deque
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, List
+from dataclasses import dataclass, field
 
-#     def get_history(self) -> list:
-#         #get all history
-#         return self.history
-    
-#     def get_summary(self) -> dict:
-#         #get summary of agent's work
-#         return{
-#             'task': self.task,
-#             'total_steps': len(self.history),
-#             'tool_calls': len(self.tool_calls),
-#             'tools_used': list(set(call['tool'] for call in self.tool_calls)),
-#         }
-    
-# #BASE AGENT CLASS
-# class BaseAgent(ABC):
-#     #this is Abstract base class for all AI agents
-#     def __init__(self, name: str, description: str):
-#         self.name = name
-#         self.description = description
-#         self.tools = {} #tools this agent can use
-#         self.memory = AgentMemory() #Agent's memory
-#         self.max_iterations = 10 #this prevent infinite loop
+logger = logging.getLogger(__name__)
 
-#         logger.info(f"Initialized agent: {name}")
+# Max sub-tasks an agent runs at the same time (see BaseAgent.run_parallel)
+MAX_CONCURRENCY = int(os.getenv("AGENT_MAX_CONCURRENCY", "4"))
 
-#     #TOOL MANAGEMENT
-#     def register_tool(self, tool: Tool ) -> None:
-#         #register the tool the agent can use means telling the agent you can use this tool
-#         self.tools[tool.name] = tool
-#         logger.info(f"Registered Tool: {tool.name}")
+# Most recent history events a Memory keeps (older ones are dropped)
+MAX_MEMORY_HISTORY = 100_000
 
-#     #LIST OF TOOLS
-#     def get_tools(self) -> list:
-#         #this gives the list of all the tools the agent has
-#         return[tool.to_dict() for tool in self.tools.values()]
-    
+# Keyword -> tool name rules for BaseAgent.decide_tool, matched in one pass
+_TOOL_RE = re.compile(r"\b(scrape|analyze|summarize)\b", re.IGNORECASE)
+_TOOL_MAP = {
+    "scrape": "scrape_website",
+    "analyze": "analyze",
+    "summarize": "summarize",
+}
 
-#     #THINKING AND REASONING
-#     def think(self, task: str) -> str:
-#         #this is where we call the OPENAI.. The agent thinks what to do
-#         thought = f"I need to complete task: {task}"
-#         self.memory.add_thoughts(thought)
-#         return thought
-    
-#     def decide_tool(self, task: str) -> str:
-#         #Agent decide which tool to use
-#         #THIS IS AGENT INTELLIGENCE!
-#         # Given a task, which tool should I use?
+# Reference point for turning monotonic history timestamps back into wall-clock time
+_T0_WALL_NS = time.time_ns()
+_T0_MONO_NS = time.monotonic_ns()
 
-#         if 'scrape' in task.lower():
-#             return 'scrape_website'
-#         elif 'analyze' in task.lower():
-#             return 'analyze'
-#         elif 'summarize' in task.lower():
-#             return 'summarize'
-#         else: 
-#             return list(self.tools.keys())[0] if self.tools else None
-        
-#     #Execute the tool which the agent has decided
-#     def execute_tool(self, tool_name: str, **params) -> Any:
-#         if tool_name not in self.tools:
-#             logger.error(f"Tool not found: {tool_name}")
-#             return f"Error: Tool '{tool_name}' not found"
-        
-#         tool = self.tools[tool_name]
-#         result = tool.execute(**params)
-#         self.memory.add_tool_call(tool_name, params, result)
 
-#         return result
-    
-#     #ABSTRACT RUN METHOD
-#     @abstractmethod
-#     def run(self, task: str) -> str:
-#         pass
-
-#     #UTILITY METHODS
-#     #this gives the summary of what agent did
-#     def get_memory_summary(self) -> dict:
-#         return self.memory.get_summary()
-    
-#     def clear_memory(self) -> None:
-#         #this clears agent memory to start fresh
-#         self.memory = AgentMemory()
-#         logger.info(f"Cleared Memory for {self.name}")
-
-#     def get_status(self) -> dict:
-#         #this gives the agents current status
-#         return{
-#             'name': self.name,
-#             'description': self.description,
-#             'tools_available': len(self.tools),
-#             'tools_name': list(self.tools.keys()),
-#             'memory_entries': len(self.memory.get_history())
-#         }
+def _iso(t: int) -> str:
+    """Format a time.monotonic_ns() timestamp as an ISO wall-clock string"""
+    return datetime.fromtimestamp((_T0_WALL_NS + t - _T0_MONO_NS) / 1e9).isoformat()
 
-from __future__ import annotations
+# ==================== TOOL CLASS ====================
 
-import logging
-from typing import Any, Optional, List
-from dataclasses import dataclass
+# Shared read-only default so tools without parameters don't each allocate a dict
+_NO_PARAMETERS: Mapping[str, Any] = MappingProxyType({})
 
-logger = logging.getLogger(__name__)
 
-# ==================== TOOL CLASS ====================
-
-@dataclass
+@dataclass(slots=True)
 class Tool:
     """Represents a tool the agent can use"""
     name: str
     description: str
     function: callable
+    parameters: Mapping[str, Any] = field(default_factory=lambda: _NO_PARAMETERS)
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
     
     def __call__(self, *args, **kwargs):
         return self.function(*args, **kwargs)
+    
+    def to_dict(self) -> dict:
+        """Structured description of the tool (built once, then reused)"""
+        if self._dict is None:
+            self._dict = {
+                'name': self.name,
+                'description': self.description,
+                'parameters': dict(self.parameters)
+            }
+        return self._dict
+
+
+# ==================== HISTORY EVENT ====================
+
+@dataclass(slots=True)
+class HistoryEvent:
+    """One entry in the agent's memory history"""
+    kind: str
+    content: Any
+    t: int  # time.monotonic_ns() when the event was recorded
+    
+    def to_dict(self, iso: bool = False) -> dict:
+        """Serialize for API responses"""
+        if iso:
+            return {'type': self.kind, 'content': self.content, 'timestamp': _iso(self.t)}
+        return {'type': self.kind, 'content': self.content, 't': self.t}
 
 
 # ==================== MEMORY CLASS ====================
@@ -233,32 +89,48 @@ class Tool:
 class Memory:
     """Agent memory to track state and history"""
     
-    def __init__(self):
+    def __init__(self, max_history: int = MAX_MEMORY_HISTORY):
         self.task = None
         self.thoughts = []
         self.tool_calls = 0
+        self._tools_used = set()
         self.findings = []
-        self.history = []
+        # Ring buffer: O(1) appends with no list regrowth, bounded on long runs
+        self.history = deque(maxlen=max_history)
+    
+    def _record(self, kind: str, content: Any) -> None:
+        # Timestamps are cheap monotonic ints; they are only formatted in get_history
+        self.history.append(HistoryEvent(kind, content, time.monotonic_ns()))
     
     def set_task(self, task: str) -> None:
         """Set the current task"""
         self.task = task
-        self.history.append(f"Task set: {task}")
+        self._record('task', task)
     
     def add_thoughts(self, thought: str) -> None:
         """Add a thought to memory"""
         self.thoughts.append(thought)
-        self.history.append(f"Thought: {thought}")
+        self._record('thought', thought)
     
     def record_tool_call(self, tool_name: str) -> None:
         """Record that a tool was called"""
         self.tool_calls += 1
-        self.history.append(f"Tool called: {tool_name}")
+        self._tools_used.add(tool_name)
+        self._record('tool_call', tool_name)
     
     def add_finding(self, finding: str) -> None:
         """Add a finding to memory"""
         self.findings.append(finding)
-        self.history.append(f"Finding: {finding}")
+        self._record('finding', finding)
+    
+    def get_history(self, iso: bool = False) -> list:
+        """
+        Get the history of this memory
+        
+        Args:
+            iso: Replace the raw monotonic 't' of each entry with an ISO 'timestamp'
+        """
+        return [event.to_dict(iso) for event in self.history]
     
     def get_summary(self) -> dict:
         """Get memory summary"""
@@ -266,6 +138,8 @@ class Memory:
             "task": self.task,
             "thoughts": self.thoughts,
             "tool_calls": self.tool_calls,
+            # Kept up to date in record_tool_call, so polling the summary stays cheap
+            "tools_used": list(self._tools_used),
             "findings": self.findings,
             "history_length": len(self.history)
         }
@@ -275,8 +149,9 @@ class Memory:
         self.task = None
         self.thoughts = []
         self.tool_calls = 0
+        self._tools_used.clear()
         self.findings = []
-        self.history = []
+        self.history.clear()
 
 
 # ==================== BASE AGENT CLASS ====================
@@ -284,37 +159,158 @@ class Memory:
 class BaseAgent:
     """Base class for all agents"""
     
-    def __init__(self, name: str = "Agent", description: str = "Base Agent"):
+    # Fixed attribute set: no per-instance __dict__ (subclasses add their own slots)
+    __slots__ = ('name', 'description', 'memory', 'tools', 'max_concurrency', 'on_event')
+    
+    def __init__(
+        self,
+        name: str = "Agent",
+        description: str = "Base Agent",
+        max_concurrency: int = MAX_CONCURRENCY,
+        on_event: Optional[Callable[[dict], Any]] = None
+    ):
         self.name = name
         self.description = description
         self.memory = Memory()
-        self.tools: List[Tool] = []
+        self.tools: Dict[str, Tool] = {}
+        self.max_concurrency = max_concurrency
+        # Called with a dict for every progress event (may be invoked from a worker thread)
+        self.on_event = on_event
         
-        logger.info(f"Initialized {self.name}")
+        logger.info("Initialized %s", self.name)
     
     def add_tool(self, tool: Tool) -> None:
-        """Add a tool to the agent"""
-        self.tools.append(tool)
-        logger.info(f"Added tool: {tool.name}")
+        """Add a tool to the agent (replaces a tool with the same name)"""
+        self.tools[tool.name] = tool
+        logger.info("Added tool: %s", tool.name)
     
     def get_tools(self) -> List[Tool]:
         """Get all available tools"""
-        return self.tools
+        return list(self.tools.values())
+    
+    def get_tool(self, name: str) -> Optional[Tool]:
+        """Look up a tool by name"""
+        return self.tools.get(name)
+    
+    def emit(self, event_type: str, message: str, **data) -> None:
+        """Report a progress event to the on_event callback, if any"""
+        if self.on_event is not None:
+            self.on_event({"type": event_type, "agent": self.name, "message": message, **data})
+    
+    def decide_tool(self, task: str) -> Optional[str]:
+        """
+        Decide which tool to use for a task
+        
+        Whole-word keywords pick the tool ("scrape" -> scrape_website);
+        otherwise the first registered tool is used.
+        """
+        match = _TOOL_RE.search(task)
+        if match:
+            return _TOOL_MAP[match.group(1).lower()]
+        return next(iter(self.tools), None)
     
     def think(self, thought: str) -> None:
         """Agent thinks (records thought)"""
         self.memory.add_thoughts(thought)
-        logger.info(f"{self.name} thought: {thought}")
+        logger.info("%s thought: %s", self.name, thought)
+        self.emit("thought", thought)
     
     def act(self, action: str) -> Any:
         """Agent takes an action"""
-        logger.info(f"{self.name} acting: {action}")
+        logger.info("%s acting: %s", self.name, action)
         return None
     
     def reset(self) -> None:
         """Reset agent state"""
         self.memory.clear()
-        logger.info(f"{self.name} reset")
+        logger.info("%s reset", self.name)
+    
+    # ==================== RUNNING TASKS ====================
+    
+    def run(self, task: str) -> Any:
+        """Run a single task (implemented by child classes)"""
+        raise NotImplementedError
+    
+    def run_sub_task(self, task: str) -> Any:
+        """
+        Run one sub-task of a larger task (default: self.run)
+        
+        Sub-tasks share this agent's Memory, so overrides should leave
+        memory.task alone; run_async sets it once for the whole task.
+        """
+        return self.run(task)
+    
+    def split_task(self, task: str) -> List[str]:
+        """Split a task into independent sub-tasks (default: the task itself)"""
+        return [task]
+    
+    async def run_parallel(self, sub_tasks: List[str]) -> List[Any]:
+        """
+        Run independent sub-tasks concurrently
+        
+        Each sub-task runs self.run_sub_task in a worker thread; at most
+        max_concurrency of them are in flight at once. A sub-task that
+        raises shows up as the exception object in the returned list.
+        """
+        if len(sub_tasks) == 1:
+            # Nothing to overlap, skip the gather/semaphore overhead
+            try:
+                return [await asyncio.to_thread(self.run_sub_task, sub_tasks[0])]
+            except Exception as e:
+                return [e]
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run_one(sub_task: str) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(self.run_sub_task, sub_task)
+        
+        return await asyncio.gather(
+            *(run_one(sub_task) for sub_task in sub_tasks),
+            return_exceptions=True
+        )
+    
+    async def run_many(self, tasks: List[str]) -> List[Any]:
+        """
+        Run a batch of independent tasks concurrently
+        
+        Results come back in the same order as tasks; a task that raised is
+        reported as an error dict instead of failing the whole batch. The
+        batch is recorded in memory as one task, its tasks joined with '; '.
+        """
+        self.memory.set_task("; ".join(tasks))
+        return await self._run_batch(tasks)
+    
+    async def _run_batch(self, tasks: List[str]) -> List[Any]:
+        # run_parallel with exceptions turned into error dicts; memory.task is left to the caller
+        results = await self.run_parallel(tasks)
+        
+        for i, (task, result) in enumerate(zip(tasks, results)):
+            if isinstance(result, Exception):
+                logger.error("Task '%s' failed: %s", task, result)
+                results[i] = {"error": str(result), "task": task, "success": False}
+        
+        return results
+    
+    async def run_async(self, task: str) -> Any:
+        """Run a task without blocking the event loop, fanning out its sub-tasks"""
+        # Recorded once here; concurrent sub-tasks would otherwise overwrite each other's task
+        self.memory.set_task(task)
+        sub_tasks = self.split_task(task)
+        
+        if len(sub_tasks) == 1:
+            [result] = await self.run_parallel(sub_tasks)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        
+        combined = await self._run_batch(sub_tasks)
+        
+        return {
+            "task": task,
+            "results": combined,
+            "success": any(r.get("success") for r in combined if isinstance(r, dict))
+        }
     
     def __str__(self) -> str:
         return f"{self.name}: {self.description}"
@@ -2,19 +2,91 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+import re
+from array import array
+from functools import lru_cache
+from typing import Any, Iterator, Optional
 
-from src.scrapers.crypto_scraper import CryptoScraper
-from src.scrapers.news_scraper import NewsScraper
 from .base_agent import BaseAgent, Tool, Memory
-from src.scrapers.general_scraper import GeneralScraper
 logger = logging.getLogger(__name__)
 
+# Task-type keywords, matched anywhere in the task in one pass (see _parse_task)
+_TASK_TYPE_RE = re.compile(r"(?P<crypto>bitcoin|btc|crypto)|(?P<news>news|article)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _classify_task(task: str) -> tuple:
+    # (query, type) for a task string; pure, so repeat tasks are a cache hit
+    # Crypto keywords win over news ones
+    matched = {match.lastgroup for match in _TASK_TYPE_RE.finditer(task)}
+    if 'crypto' in matched:
+        return 'bitcoin', 'crypto'
+    if 'news' in matched:
+        return task, 'news'
+    return task, 'general'
+
+
+# Optional list fields of general info, in display order: (key, label, separator)
+_GENERAL_FIELDS = (
+    ('applications', 'Key Applications', ', '),
+    ('examples', 'Examples', ', '),
+    ('types', 'Types', ', '),
+    ('libraries', 'Popular Libraries/Tools', ', '),
+    ('use_cases', 'Use Cases', ', '),
+    ('layers', 'Components', ', '),
+    ('process', 'Process Steps', ' → '),
+)
+
+# Crypto 'results' block; fields missing from the data show as N/A
+_CRYPTO_TEMPLATE = (
+    "{symbol} Information:\n"
+    "Current Price: {price}\n"
+    "24h Change: {change}\n"
+    "Market Cap: {market_cap}\n"
+)
+
+
+class _Fields(dict):
+    # format_map mapping that fills in missing fields instead of raising KeyError
+    def __missing__(self, key):
+        return 'N/A'
+
+
+# Metadata keys of a price dict that are not coins
+_CRYPTO_META_KEYS = frozenset(('query', 'source', 'success'))
+
+
+def _format_crypto_prices(prices: dict) -> list:
+    # One "COIN: price" line per coin in a flat {coin: price} dict
+    # Scraper records hold raw numbers, so they are formatted for display here
+    from src.scrapers.crypto_scraper import format_record
+    return [
+        f"{key.upper()}: {format_record(value) if isinstance(value, dict) else value}\n"
+        for key, value in prices.items() if key not in _CRYPTO_META_KEYS
+    ]
+
+# Task type -> name of the scraper that handles it (anything else goes to 'general')
+_SCRAPER_FOR_TYPE = {'crypto': 'crypto', 'news': 'news', 'general': 'general'}
+
+# How ResearchAgent calls each kind of scraper (see the scrapers' fetch_kind)
+_FETCHERS = {
+    'prices': lambda scraper, query: scraper.fetch_prices([query]),
+    'article': lambda scraper, query: scraper.fetch_article(query),
+    'general': lambda scraper, query: scraper.fetch_general(query),
+}
+
+# Fallback for scrapers without a fetch_kind, in priority order
+_FETCH_METHODS = (('prices', 'fetch_prices'), ('article', 'fetch_article'), ('general', 'fetch_general'))
+
 # ==================== DUMMY SCRAPER CLASS ====================
 
 class DummyScraper:
     """Dummy scraper for testing - returns mock data"""
     
+    __slots__ = ('name',)
+    
+    fetch_kind = 'prices'
+    
     def __init__(self):
         self.name = "DummyScraper"
     
@@ -53,7 +125,17 @@ class DummyScraper:
 class ResearchAgent(BaseAgent):
     """Agent that researches topics using web scrapers and analysis"""
     
-    def __init__(self):
+    __slots__ = (
+        'scraper_tools', 'analysis_tools', 'max_research_depth',
+        '_queries', '_successes', '_scraped_data', '_analyses'
+    )
+    
+    def __init__(self, session: Optional[Any] = None):
+        """
+        Args:
+            session: Shared requests.Session handed to the default scrapers so
+                     every agent reuses the same pooled connections
+        """
         super().__init__(
             name="ResearchAgent",
             description="Researches topics using web scrapers and analysis"
@@ -65,16 +147,23 @@ class ResearchAgent(BaseAgent):
         # Store analysis tools
         self.analysis_tools = {}
 
-        # Store search results
-        self.search_results = []
+        # Store search results column by column (one entry per run in each)
+        self._queries = []
+        self._successes = array('b')
+        self._scraped_data = []
+        self._analyses = []
 
         # Max depth of research
         self.max_research_depth = 3
 
-        # Register default scrapers
-        self.register_scraper('crypto', CryptoScraper())
-        self.register_scraper('news', NewsScraper())
-        self.register_scraper('general', GeneralScraper())
+        # Register default scrapers (imported here so importing this module doesn't load requests)
+        from src.scrapers.crypto_scraper import CryptoScraper
+        from src.scrapers.general_scraper import GeneralScraper
+        from src.scrapers.news_scraper import NewsScraper
+
+        self.register_scraper('crypto', CryptoScraper(session=session))
+        self.register_scraper('news', NewsScraper(session=session))
+        self.register_scraper('general', GeneralScraper(session=session))
 
         logger.info("Research Agent Initialized with default scrapers")
 
@@ -89,15 +178,22 @@ class ResearchAgent(BaseAgent):
             agent.register_scraper('crypto', crypto_scraper)
         """
         self.scraper_tools[scraper_name] = scraper_object
-        logger.info(f"Registered Scraper: {scraper_name}")
+        logger.info("Registered Scraper: %s", scraper_name)
 
     # ==================== RESEARCH METHOD (Main logic) ====================
 
     def run(self, task: str) -> dict:
         # Store task in memory
         self.memory.set_task(task)
-        
-        logger.info(f"Starting Research on: {task}")
+        return self._research(task)
+    
+    def run_sub_task(self, task: str) -> dict:
+        # Research one part of a ';'-separated task; run_async has already stored the whole task
+        return self._research(task)
+    
+    def _research(self, task: str) -> dict:
+        logger.info("Starting Research on: %s", task)
+        self.emit("task", f"Researching: {task}", task=task)
 
         # STEP 1: Parse the task
         parsed_task = self._parse_task(task)
@@ -113,21 +209,27 @@ class ResearchAgent(BaseAgent):
         # STEP 2: Decide which scraper to use
         scraper_name = self._decide_scraper(parsed_task)
 
-        self.memory.add_thoughts(
-            f"Decided to use: '{scraper_name}' scraper for this research"
-        )
+        self.think(f"Decided to use: '{scraper_name}' scraper for this research")
 
         # STEP 3: Execute the scraper
         if scraper_name not in self.scraper_tools:
-            logger.error(f"Scraper not found: {scraper_name}")
+            logger.error("Scraper not found: %s", scraper_name)
             return{
                 "error": f"Scraper '{scraper_name}' not registered",
                 "available_scraper": list(self.scraper_tools.keys()),
                 "success": False
             }
         
+        # Repeat queries are answered from each scraper's own TTL cache
         scraper = self.scraper_tools[scraper_name]
         self.memory.record_tool_call(scraper_name)
+        self.emit(
+            "tool_call",
+            f"Searching with the {scraper_name} scraper...",
+            task=task,
+            tool=scraper_name,
+            tool_calls=self.memory.tool_calls
+        )
         scraped_data = self._execute_scraper(scraper, parsed_task)
 
         if not scraped_data:
@@ -139,6 +241,7 @@ class ResearchAgent(BaseAgent):
             }
         
         # STEP 4: Analyze data
+        self.emit("analysis", "Analyzing findings...", task=task)
         analysis = self._analyze_data(scraped_data, parsed_task)
         self.memory.add_finding(analysis)
 
@@ -150,70 +253,63 @@ class ResearchAgent(BaseAgent):
         research_result['analysis'] = analysis
         research_result['success'] = True
 
-        self.search_results.append(research_result)
+        self._queries.append(research_result['query'])
+        self._successes.append(research_result['success'])
+        self._scraped_data.append(scraped_data)
+        self._analyses.append(analysis)
         logger.info("Research Completed Successfully")
         
         return research_result
     
+    def split_task(self, task: str) -> list:
+        """
+        Split a task into independent sub-queries separated by ';'
+        
+        Example:
+            "bitcoin price; AI news" -> ["bitcoin price", "AI news"]
+        """
+        if not isinstance(task, str):
+            return [task]
+        
+        sub_tasks = [part.strip() for part in task.split(';') if part.strip()]
+        return sub_tasks or [task]
+
     # ==================== HELPER METHODS ====================
 
-    def _parse_task(self, task: str) -> dict:
+    @staticmethod
+    def _parse_task(task: str) -> dict:
+        # Needs no agent state, so it is callable on the class as well
 
         # Validate input
         if not task or not isinstance(task, str):
             logger.error("Invalid task format")
             return {}
         
-        task_lower = task.lower()
-        parsed = {}
-        parsed['topic'] = task
-
-        # Determine task type
-        if 'bitcoin' in task_lower or 'btc' in task_lower or 'crypto' in task_lower:
-            parsed['query'] = 'bitcoin'
-            parsed['type'] = 'crypto'
-        elif 'news' in task_lower or 'article' in task_lower:
-            parsed['query'] = task
-            parsed['type'] = 'news'
-        else:
-            parsed['query'] = task
-            parsed['type'] = 'general'
-
-        logger.info(f"Parsed Task: {parsed}")
-        return parsed
+        query, task_type = _classify_task(task)
+        return {'topic': task, 'query': query, 'type': task_type}
     
     def _decide_scraper(self, parsed_task: dict) -> str:
 
-        task_type = parsed_task.get('type', 'general')
-
-        if task_type == 'crypto':
-            return 'crypto'
-        elif task_type == 'news':
-            return 'news'
-        else:
-            return 'general'
+        return _SCRAPER_FOR_TYPE.get(parsed_task.get('type'), 'general')
     
     def _execute_scraper(self, scraper: Any, parsed_task: dict) -> Any:
 
         try:
             query = parsed_task.get('query')
 
-            # Try different scraper methods
-            if hasattr(scraper, 'fetch_prices'):
-                return scraper.fetch_prices([query])
+            # Scrapers declare their fetch_kind; others are probed for a known method
+            fetch_kind = getattr(scraper, 'fetch_kind', None)
+            if fetch_kind not in _FETCHERS:
+                fetch_kind = next((kind for kind, method in _FETCH_METHODS if hasattr(scraper, method)), None)
             
-            elif hasattr(scraper, 'fetch_article'):
-                return scraper.fetch_article(query)
-            
-            elif hasattr(scraper, 'fetch_general'):
-                return scraper.fetch_general(query)
-            
-            else:
+            if fetch_kind is None:
                 logger.error("Scraper has no recognized method")
                 return None
             
+            return _FETCHERS[fetch_kind](scraper, query)
+            
         except Exception as e:
-            logger.error(f"Scraper error: {e}")
+            logger.exception("Scraper error: %s", e)
             return None
     
     def _analyze_data(self, data: Any, parsed_task: dict) -> str:
@@ -226,74 +322,49 @@ class ResearchAgent(BaseAgent):
     
     # ==================== FORMAT BY TYPE ====================
     
+        # Pieces are collected in a list and joined once instead of growing a string with +=
+        parts = [f"Research findings for {topic}:\n\n"]
+
         if task_type == 'crypto':
             # Crypto data format
             crypto_data = data
-            analysis = f"Research findings for {topic}:\n\n"
         
             if 'results' in crypto_data:
-                results = crypto_data['results']
-                analysis += f"{results.get('symbol', '')} Information:\n"
-                analysis += f"Current Price: {results.get('price', 'N/A')}\n"
-                analysis += f"24h Change: {results.get('change', 'N/A')}\n"
-                analysis += f"Market Cap: {results.get('market_cap', 'N/A')}\n"
+                parts.append(_CRYPTO_TEMPLATE.format_map(_Fields({'symbol': ''}, **crypto_data['results'])))
             else:
-                for key, value in crypto_data.items():
-                    if key not in ['query', 'source', 'success']:
-                     analysis += f"{key.upper()}: {value}\n"
+                parts.extend(_format_crypto_prices(crypto_data))
         
-            return analysis
+            return "".join(parts)
     
         elif task_type == 'news':
-        # News data format
-            analysis = f"Research findings for {topic}:\n\n"
-        
+            # News data format
             if 'articles' in data:
                 articles = data['articles']
                 for i, article in enumerate(articles, 1):
-                    analysis += f"Article {i}: {article.get('title', 'N/A')}\n"
-                    analysis += f"Content: {article.get('content', 'N/A')}\n"
-                    analysis += f"Source: {article.get('source', 'N/A')}\n"
-                    analysis += f"Date: {article.get('date', 'N/A')}\n\n"
+                    parts.append(f"Article {i}: {article.get('title', 'N/A')}\n")
+                    parts.append(f"Content: {article.get('content', 'N/A')}\n")
+                    parts.append(f"Source: {article.get('source', 'N/A')}\n")
+                    parts.append(f"Date: {article.get('date', 'N/A')}\n\n")
         
-            return analysis
+            return "".join(parts)
     
         elif task_type == 'general':
             # General information format - PARAGRAPH TEXT
-            analysis = f"Research findings for {topic}:\n\n"
-        
             if 'info' in data:
                 info = data['info']
             
                 # Main title
-                analysis += f"**{info.get('title', 'Information')}**\n\n"
+                parts.append(f"**{info.get('title', 'Information')}**\n\n")
             
                 # Description as paragraph
-                analysis += f"{info.get('description', '')}\n\n"
+                parts.append(f"{info.get('description', '')}\n\n")
             
                 # Format other fields as readable text
-                if 'applications' in info:
-                    analysis += f"Key Applications: {', '.join(info['applications'])}\n"
-            
-                if 'examples' in info:
-                    analysis += f"Examples: {', '.join(info['examples'])}\n"
-            
-                if 'types' in info:
-                    analysis += f"Types: {', '.join(info['types'])}\n"
-            
-                if 'libraries' in info:
-                    analysis += f"Popular Libraries/Tools: {', '.join(info['libraries'])}\n"
-            
-                if 'use_cases' in info:
-                    analysis += f"Use Cases: {', '.join(info['use_cases'])}\n"
-            
-                if 'layers' in info:
-                    analysis += f"Components: {', '.join(info['layers'])}\n"
-            
-                if 'process' in info:
-                    analysis += f"Process Steps: {' → '.join(info['process'])}\n"
+                for field, label, separator in _GENERAL_FIELDS:
+                    if field in info:
+                        parts.append(f"{label}: {separator.join(info[field])}\n")
         
-            return analysis
+            return "".join(parts)
     
         else:
             # Default format
@@ -303,21 +374,37 @@ class ResearchAgent(BaseAgent):
 
     def get_research_history(self) -> list:
         # """Get all research history"""
-        return self.search_results
+        # Rows are rebuilt from the columns on demand
+        return [
+            {'query': query, 'scraped_data': scraped_data, 'analysis': analysis, 'success': bool(success)}
+            for query, scraped_data, analysis, success
+            in zip(self._queries, self._scraped_data, self._analyses, self._successes)
+        ]
     
     def get_research_summary(self) -> dict:
         # """Get summary of research conducted"""
         return{
-            'total_research': len(self.search_results),
-            'successful': sum(1 for r in self.search_results if r.get('success')),
-            'queries': [r.get('query') for r in self.search_results],
+            'total_research': len(self._queries),
+            'successful': sum(self._successes),
             'agent_memory': self.memory.get_summary()
         }
     
+    def get_queries(self) -> Iterator[str]:
+        # """Iterate over the queries researched so far (no copy is made)"""
+        return iter(self._queries)
+    
     def clear_history(self) -> None:
         # """Clear research history"""
-        self.search_results = []
+        self._queries.clear()
+        del self._successes[:]
+        self._scraped_data.clear()
+        self._analyses.clear()
         logger.info("Research history cleared")
+    
+    def reset(self) -> None:
+        """Reset memory and research history so the agent can be reused"""
+        super().reset()
+        self.clear_history()
 
 
 
@@ -1,19 +1,98 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
+import threading
+import time
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
+from src.utils import json_utils
 
 logger = logging.getLogger(__name__)
 
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+DEFAULT_MAX_RETRIES = 3
+
+# Random extra backoff (seconds) so parallel requests don't retry in lockstep; needs urllib3 2.x
+_RETRY_JITTER = {'backoff_jitter': 0.2} if int(urllib3.__version__.split('.')[0]) >= 2 else {}
+
+# Sent with every request made through a session from build_session
+# (all scraped APIs answer JSON; gzip and keep-alive are spelled out for proxies that drop defaults)
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept': 'application/json',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+# Process-wide sessions for scrapers that aren't given one, by max_retries (see shared_session)
+_session_pool = {}
+_session_pool_lock = threading.Lock()
+
+
+def build_session(max_retries: int = DEFAULT_MAX_RETRIES, pool_size: int = 32) -> requests.Session:
+    """
+    Create a pooled HTTP session that retries failed GET/HEAD requests with jittered exponential backoff
+    
+    Retries happen inside urllib3, so fetch code only sees the final outcome.
+    
+    Args:
+        max_retries: Retry attempts per request
+        pool_size: Connections kept open per host
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=0.3,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(("GET", "HEAD")),
+        respect_retry_after_header=True,  # back off as long as a 429/503 asks
+        **_RETRY_JITTER
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def shared_session(max_retries: int = DEFAULT_MAX_RETRIES) -> requests.Session:
+    """
+    Session shared by every scraper created without one
+    
+    Built on first use for each retry setting, so scrapers in the same process
+    reuse one connection pool (and its keep-alive connections) instead of
+    opening their own. Pooled sessions are closed when the process exits.
+    """
+    session = _session_pool.get(max_retries)
+    if session is None:
+        with _session_pool_lock:
+            session = _session_pool.get(max_retries)
+            if session is None:
+                session = _session_pool[max_retries] = build_session(max_retries)
+                atexit.register(session.close)
+    return session
+
+
+def format_ts(ns: int) -> str:
+    """Format an epoch-nanosecond timestamp (e.g. scraped_at_ns) as local ISO time"""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000).isoformat()
+
+
+def _append_bytes(path: str, payload: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(payload)
+
 
 class BaseScraper(ABC):
     """
@@ -21,7 +100,16 @@ class BaseScraper(ABC):
     Provides common scraping functionality that all scrapers inherit.
     """
     
-    def __init__(self, name: str = "BaseScraper", timeout: int = 10, max_retries: int = 3):
+    # No per-instance __dict__; subclasses list their own attributes the same way
+    __slots__ = ('name', 'timeout', 'max_retries', 'session', 'headers', 'scraped_data')
+    
+    def __init__(
+        self,
+        name: str = "BaseScraper",
+        timeout: int = 10,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        session: Optional[requests.Session] = None
+    ):
         """
         Initialize the scraper
         
@@ -29,17 +117,18 @@ class BaseScraper(ABC):
             name: Name of the scraper
             timeout: Request timeout in seconds
             max_retries: Maximum number of retry attempts
+            session: HTTP session to use, normally from build_session (defaults to the
+                     process-wide shared_session() for max_retries)
         """
         self.name = name
         self.timeout = timeout
         self.max_retries = max_retries
-        self.session = requests.Session()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        self.session = session if session is not None else shared_session(max_retries)
+        # Per-instance copy: editing it never changes DEFAULT_HEADERS or other scrapers
+        self.headers = dict(DEFAULT_HEADERS)
         self.scraped_data = []
         
-        logger.info(f"Initialized {self.name} scraper")
+        logger.info("Initialized %s scraper", self.name)
     
     # ==================== ABSTRACT METHODS ====================
     
@@ -111,6 +200,22 @@ class BaseScraper(ABC):
     
     # ==================== FETCH URL METHOD ====================
     
+    def _request_headers(self, extra: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        
+        # Headers to pass with one request, or None when the session already sends them
+        
+        # Sessions from build_session carry DEFAULT_HEADERS, so the usual case adds
+        # nothing per request; a caller's own session (or edited self.headers) gets
+        # self.headers on every request instead
+        
+        # Args:
+        #     extra: Request-specific headers (e.g. If-None-Match)
+        
+        session_headers = self.session.headers
+        if all(session_headers.get(key) == value for key, value in self.headers.items()):
+            return extra
+        return {**self.headers, **extra} if extra else self.headers
+    
     def fetch_url(self, url: str) -> Optional[requests.Response]:
         
         # Fetch a URL with retry logic
@@ -121,37 +226,38 @@ class BaseScraper(ABC):
         # Returns:
         #     requests.Response or None if all retries failed
         
-        logger.info(f"Fetching URL: {url}")
-        
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.get(
-                    url,
-                    timeout=self.timeout,
-                    headers=self.headers
-                )
-                
-                # Check if response is successful
-                response.raise_for_status()
-                
-                logger.info(f"Successfully fetched URL: {url}")
-                return response
-            
-            except requests.exceptions.Timeout:
-                logger.warning(f"Timeout on attempt {attempt + 1}/{self.max_retries}")
-            
-            except requests.exceptions.ConnectionError:
-                logger.warning(f"Connection error on attempt {attempt + 1}/{self.max_retries}")
+        logger.debug("Fetching URL: %s", url)
+        
+        # Retries with backoff are handled by the session's adapter (see build_session)
+        try:
+            response = self.session.get(url, headers=self._request_headers(), timeout=self.timeout)
             
-            except requests.exceptions.HTTPError as e:
-                logger.warning(f"HTTP error on attempt {attempt + 1}/{self.max_retries}: {e}")
+            # Check if response is successful
+            response.raise_for_status()
             
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
+            logger.debug("Successfully fetched URL: %s", url)
+            return response
+        
+        except Exception as e:
+            # One handler for request errors and anything unexpected; the class name tells them apart
+            logger.warning("Request failed (%s): %s", e.__class__.__name__, e)
         
-        logger.error(f"Failed to fetch URL after {self.max_retries} attempts: {url}")
+        logger.error("Failed to fetch URL after %d attempts: %s", self.max_retries, url)
         return None
     
+    async def afetch_url(self, url: str) -> Optional[requests.Response]:
+        
+        # Async fetch_url: runs the blocking request in a worker thread so the
+        # event loop stays free and several fetches can be awaited together
+        
+        # Args:
+        #     url: URL to fetch
+        
+        # Returns:
+        #     requests.Response or None if all retries failed
+        
+        return await asyncio.to_thread(self.fetch_url, url)
+    
     # ==================== DATA MANAGEMENT METHODS ====================
     
     def save_data(self, data: Dict[str, Any]) -> None:
@@ -161,14 +267,25 @@ class BaseScraper(ABC):
         # Args:
         #     data: Data to save
         
-        # Add metadata
+        # Add metadata (epoch nanoseconds; see format_ts for display)
         data_with_metadata = {
             **data,
-            'scraped_at': datetime.now().isoformat()
+            'scraped_at_ns': time.time_ns()
         }
         
         self.scraped_data.append(data_with_metadata)
-        logger.info(f"Data saved")
+        logger.debug("Data saved (%d fields)", len(data))
+    
+    def save_many(self, records: List[Dict[str, Any]]) -> None:
+        
+        # Save a batch of records, all stamped with one timestamp
+        
+        # Args:
+        #     records: Data dicts to save (left unmodified)
+        
+        scraped_at_ns = time.time_ns()
+        self.scraped_data.extend({**record, 'scraped_at_ns': scraped_at_ns} for record in records)
+        logger.debug("Saved %d records", len(records))
     
     def get_scraped_data(self) -> List[Dict[str, Any]]:
         
@@ -184,6 +301,34 @@ class BaseScraper(ABC):
         self.scraped_data = []
         logger.info("Cleared all scraped data")
     
+    async def flush(self, path: str) -> int:
+        """
+        Append all stored data to a JSON Lines file and clear it
+        
+        Records are serialized up front and written with one call in a worker
+        thread, so the event loop never blocks on disk I/O.
+        
+        Args:
+            path: File to append to (one JSON object per line)
+        
+        Returns:
+            int: Number of records written
+        """
+        records, self.scraped_data = self.scraped_data, []
+        if not records:
+            return 0
+        
+        try:
+            payload = b"".join(json_utils.dumps(record) + b"\n" for record in records)
+            await asyncio.to_thread(_append_bytes, path, payload)
+        except Exception:
+            # Keep the records (ahead of anything saved meanwhile) so a later flush can retry
+            self.scraped_data = records + self.scraped_data
+            raise
+        
+        logger.info("Flushed %d records to %s", len(records), path)
+        return len(records)
+    
     # ==================== UTILITY METHODS ====================
     
     def summary(self) -> Dict[str, Any]:
@@ -206,7 +351,7 @@ class BaseScraper(ABC):
         Returns:
             dict: Parsed and validated data
         """
-        logger.info(f"Starting scrape of {url}")
+        logger.info("Starting scrape of %s", url)
         
         # STEP 1: Fetch the URL
         response = self.fetch_url(url)
@@ -218,7 +363,7 @@ class BaseScraper(ABC):
         try:
             parsed_data = self.parse_data(response)
         except Exception as e:
-            logger.error(f"Error parsing data: {e}")
+            logger.error("Error parsing data: %s", e)
             return None
         
         # STEP 3: Validate the data
@@ -236,13 +381,14 @@ class BaseScraper(ABC):
     
     def __enter__(self):
         """Enter context manager"""
-        logger.info(f"Entering {self.name} context")
+        logger.debug("Entering %s context", self.name)
         return self
     
     def __exit__(self, exc_type, exc_value, exc_traceback):
         """Exit context manager"""
-        logger.info(f"Exiting {self.name} context")
-        self.session.close()
+        logger.debug("Exiting %s context", self.name)
+        # The session is shared (or owned by the caller), so it is left open;
+        # pooled sessions are closed at process exit
     
     # ==================== STRING REPRESENTATION ====================
     
@@ -253,43 +399,3 @@ class BaseScraper(ABC):
     def __repr__(self) -> str:
         """Developer representation"""
         return f"<{self.__class__.__name__} name='{self.name}' timeout={self.timeout}>"
-
-# """Base scraper class"""
-
-# from abc import ABC, abstractmethod
-# import logging
-
-# logger = logging.getLogger(__name__)
-
-
-# class BaseScraper(ABC):
-#     """Base class for all scrapers"""
-    
-#     def __init__(self, name: str = "BaseScraper"):
-#         self.name = name
-#         logger.info(f"Initialized {self.name}")
-    
-#     @abstractmethod
-#     def fetch(self, query: str):
-#         """
-#         Fetch data based on query
-        
-#         Args:
-#             query: Search query
-        
-#         Returns:
-#             Data from scraper
-#         """
-#         pass
-    
-#     def validate_query(self, query: str) -> bool:
-#         """Validate query before scraping"""
-#         if not query or not isinstance(query, str):
-#             logger.error("Invalid query")
-#             return False
-#         return True
-    
-#     def __str__(self) -> str:
-#         return f"{self.name} Scraper"
-
-
@@ -2,39 +2,82 @@
 
 from __future__ import annotations
 
+import re
 import requests
+from urllib.parse import urlencode
+from typing import Optional
 import logging
 from .base_scraper import BaseScraper
+from src.utils import json_utils
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Display format for each numeric field of a price record
+_PRICE_FORMATS = {
+    "price_usd": "${:,.2f}",
+    "market_cap_usd": "${:,.0f}",
+    "24h_volume_usd": "${:,.0f}",
+    "24h_change_percent": "{:.2f}%",
+}
+
+
+def format_record(record: dict) -> dict:
+    """
+    Copy of a price record with its numbers formatted for display
+    
+    Records keep raw floats so they can still be compared and summed;
+    formatting only happens here, when the record is shown.
+    """
+    return {
+        key: _PRICE_FORMATS[key].format(value) if key in _PRICE_FORMATS else value
+        for key, value in record.items()
+    }
+
 
 class CryptoScraper(BaseScraper):
     """Scraper for real cryptocurrency data from CoinGecko API"""
     
-    def __init__(self):
-        super().__init__(name="CryptoScraper")
+    __slots__ = ('base_url', '_cache')
+    
+    # How ResearchAgent calls this scraper (fetch_prices)
+    fetch_kind = 'prices'
+    
+    # Seconds a fetched price is reused before asking CoinGecko again
+    PRICE_TTL = 60
+    
+    # Map common names to CoinGecko IDs (shared by all instances)
+    crypto_map = {
+        "bitcoin": "bitcoin",
+        "btc": "bitcoin",
+        "ethereum": "ethereum",
+        "eth": "ethereum",
+        "cardano": "cardano",
+        "ada": "cardano",
+        "ripple": "ripple",
+        "xrp": "ripple",
+        "solana": "solana",
+        "sol": "solana",
+        "litecoin": "litecoin",
+        "ltc": "litecoin",
+        "dogecoin": "dogecoin",
+        "doge": "dogecoin",
+    }
+    
+    # Any map key as a whole word (plurals too, e.g. "dogecoins"), longest first
+    # so "bitcoin" wins over shorter keys
+    _crypto_re = re.compile(
+        r"\b(" + "|".join(sorted(map(re.escape, crypto_map), key=len, reverse=True)) + r")s?\b"
+    )
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        super().__init__(name="CryptoScraper", session=session)
         
         # CoinGecko API endpoint
         self.base_url = "https://api.coingecko.com/api/v3"
         
-        # Map common names to CoinGecko IDs
-        self.crypto_map = {
-            "bitcoin": "bitcoin",
-            "btc": "bitcoin",
-            "ethereum": "ethereum",
-            "eth": "ethereum",
-            "cardano": "cardano",
-            "ada": "cardano",
-            "ripple": "ripple",
-            "xrp": "ripple",
-            "solana": "solana",
-            "sol": "solana",
-            "litecoin": "litecoin",
-            "ltc": "litecoin",
-            "dogecoin": "dogecoin",
-            "doge": "dogecoin",
-        }
+        # Formatted prices by CoinGecko ID (only successful lookups are cached)
+        self._cache = TTLCache(default_ttl=self.PRICE_TTL, max_size=256)
         
         logger.info("CryptoScraper Initialized")
     
@@ -45,56 +88,78 @@ class CryptoScraper(BaseScraper):
             return {"error": "Invalid query", "success": False}
         
         try:
-            query_lower = query.lower()
-            
-            # Find matching crypto ID
-            crypto_id = None
-            for key, value in self.crypto_map.items():
-                if key in query_lower:
-                    crypto_id = value
-                    break
+            crypto_id = self._resolve_id(query)
             
-            # Default to bitcoin if not found
-            if not crypto_id:
-                crypto_id = "bitcoin"
-                logger.warning(f"Crypto not found for '{query}', defaulting to Bitcoin")
+            # Callers get their own copy so editing a result can't change the cached one
+            cached = self._cache.get(crypto_id)
+            if cached is not None:
+                return dict(cached)
             
-            # Make API request to CoinGecko
-            url = f"{self.base_url}/simple/price"
-            params = {
-                "ids": crypto_id,
-                "vs_currencies": "usd",
-                "include_market_cap": "true",
-                "include_24h_vol": "true",
-                "include_24h_change": "true"
-            }
-            
-            logger.info(f"Fetching data for {crypto_id}...")
-            response = requests.get(url, params=params, timeout=5)
-            response.raise_for_status()
+            logger.debug("Fetching data for %s...", crypto_id)
+            response = self._request_prices([crypto_id])
             
             # Parse the response
-            return self.parse_data(response)
+            formatted_response = self.parse_data(response)
+            if formatted_response.get("success"):
+                self._cache.set(crypto_id, formatted_response)
+                return dict(formatted_response)
+            return formatted_response
         
-        except requests.exceptions.Timeout:
-            error_msg = "Request timeout - CoinGecko server not responding"
-            logger.error(error_msg)
-            return {"error": error_msg, "success": False}
+        except Exception as e:
+            return self._request_error(e)
+    
+    # ==================== REQUEST HELPERS ====================
+    
+    def _resolve_id(self, query: str) -> str:
+        """Map a free-text query to a CoinGecko ID (bitcoin if nothing matches)"""
+        query_lower = query.lower().strip()
         
-        except requests.exceptions.ConnectionError:
-            error_msg = "Connection error - check your internet connection"
-            logger.error(error_msg)
-            return {"error": error_msg, "success": False}
+        # Common case: the query is exactly a known name or symbol
+        crypto_id = self.crypto_map.get(query_lower)
+        if crypto_id is not None:
+            return crypto_id
         
-        except requests.exceptions.RequestException as e:
-            error_msg = f"Request error: {str(e)}"
-            logger.error(error_msg)
-            return {"error": error_msg, "success": False}
+        # Otherwise find a matching crypto ID in one scan
+        match = self._crypto_re.search(query_lower)
+        if match:
+            return self.crypto_map[match.group(1)]
         
-        except Exception as e:
+        # Default to bitcoin if not found
+        logger.warning("Crypto not found for '%s', defaulting to Bitcoin", query)
+        return "bitcoin"
+    
+    def build_price_url(self, crypto_ids: list, currency: str = "usd") -> str:
+        """CoinGecko /simple/price URL covering every ID in one request"""
+        params = {
+            "ids": ",".join(crypto_ids),
+            "vs_currencies": currency,
+            "include_market_cap": "true",
+            "include_24hr_vol": "true",
+            "include_24hr_change": "true"
+        }
+        return f"{self.base_url}/simple/price?{urlencode(params, safe=',')}"
+    
+    def _request_prices(self, crypto_ids: list) -> requests.Response:
+        """One CoinGecko /simple/price request for any number of IDs"""
+        response = self.session.get(
+            self.build_price_url(crypto_ids), headers=self._request_headers(), timeout=5
+        )
+        response.raise_for_status()
+        return response
+    
+    def _request_error(self, e: Exception) -> dict:
+        """Turn a failed request into the error dict returned to callers"""
+        if isinstance(e, requests.exceptions.Timeout):
+            error_msg = "Request timeout - CoinGecko server not responding"
+        elif isinstance(e, requests.exceptions.ConnectionError):
+            error_msg = "Connection error - check your internet connection"
+        elif isinstance(e, requests.exceptions.RequestException):
+            error_msg = f"Request error: {str(e)}"
+        else:
             error_msg = f"Unexpected error: {str(e)}"
-            logger.error(error_msg)
-            return {"error": error_msg, "success": False}
+        
+        logger.error(error_msg)
+        return {"error": error_msg, "success": False}
     
     # ==================== ABSTRACT METHOD 2: PARSE_DATA ====================
     
@@ -111,39 +176,81 @@ class CryptoScraper(BaseScraper):
             dict: Parsed cryptocurrency data
         """
         try:
-            data = response.json()
+            data = json_utils.loads(response.content)
             
             if not data:
                 return {"error": "No data in response", "success": False}
             
             # Get first crypto in response
-            crypto_id = list(data.keys())[0]
-            crypto_data = data[crypto_id]
+            crypto_id = next(iter(data))
+            formatted_response = self._format_price(crypto_id, data[crypto_id])
             
-            formatted_response = {
-                "crypto_id": crypto_id.upper(),
-                "price_usd": f"${crypto_data['usd']:,.2f}",
-                "market_cap_usd": f"${crypto_data.get('usd_market_cap', 0):,.0f}",
-                "24h_volume_usd": f"${crypto_data.get('usd_24h_vol', 0):,.0f}",
-                "24h_change_percent": f"{crypto_data.get('usd_24h_change', 0):.2f}%",
-                "source": "CoinGecko API",
-                "success": True
-            }
-            
-            logger.info(f"Parsed cryptocurrency data")
+            logger.debug("Parsed cryptocurrency data")
             return formatted_response
         
         except Exception as e:
-            logger.error(f"Error parsing data: {e}")
+            logger.error("Error parsing data: %s", e)
             return {"error": str(e), "success": False}
     
+    def _format_price(self, crypto_id: str, crypto_data: dict) -> dict:
+        """One coin's entry from a /simple/price response, as numbers (see format_record)"""
+        return {
+            "crypto_id": crypto_id.upper(),
+            "price_usd": float(crypto_data.get('usd', 0.0)),
+            "market_cap_usd": float(crypto_data.get('usd_market_cap', 0.0)),
+            "24h_volume_usd": float(crypto_data.get('usd_24h_vol', 0.0)),
+            "24h_change_percent": float(crypto_data.get('usd_24h_change', 0.0)),
+            "source": "CoinGecko API",
+            "success": True
+        }
+    
     # ==================== CONVENIENCE METHODS ====================
     
     def fetch_prices(self, queries: list) -> dict:
-        """Fetch prices for multiple cryptocurrencies"""
+        """
+        Fetch prices for multiple cryptocurrencies
+        
+        All queries are answered by a single CoinGecko request (comma-separated
+        IDs), so N coins cost one round-trip instead of N.
+        """
+        crypto_ids = {query: self._resolve_id(query) for query in queries if self.validate_query(query)}
+        
+        # Recently fetched coins come from the cache; only the rest are requested
+        prices = {}
+        for crypto_id in dict.fromkeys(crypto_ids.values()):
+            cached = self._cache.get(crypto_id)
+            if cached is not None:
+                prices[crypto_id] = cached
+        
+        data, error = {}, None
+        missing_ids = [crypto_id for crypto_id in dict.fromkeys(crypto_ids.values()) if crypto_id not in prices]
+        if missing_ids:
+            try:
+                logger.debug("Fetching data for %s...", missing_ids)
+                data = json_utils.loads(self._request_prices(missing_ids).content)
+            except Exception as e:
+                error = self._request_error(e)
+        
         results = {}
         for query in queries:
-            results[query] = self.fetch(query)
+            crypto_id = crypto_ids.get(query)
+            if crypto_id is None:
+                results[query] = {"error": "Invalid query", "success": False}
+            elif crypto_id in prices:
+                # A copy per query (records are flat), so no caller can change the cached record
+                results[query] = dict(prices[crypto_id])
+            elif error is not None:
+                results[query] = error
+            elif crypto_id not in data:
+                results[query] = {"error": f"No data for {crypto_id}", "success": False}
+            else:
+                try:
+                    prices[crypto_id] = self._format_price(crypto_id, data[crypto_id])
+                    self._cache.set(crypto_id, prices[crypto_id])
+                    results[query] = dict(prices[crypto_id])
+                except Exception as e:
+                    logger.error("Error parsing data: %s", e)
+                    results[query] = {"error": str(e), "success": False}
         return results
     
     def validate_data(self, data: dict) -> bool:
@@ -151,86 +258,3 @@ class CryptoScraper(BaseScraper):
         if not data:
             return False
         return data.get("success", False)
-
-
-# """Cryptocurrency scraper"""
-
-# import logging
-# from .base_scraper import BaseScraper
-
-# logger = logging.getLogger(__name__)
-
-
-# class CryptoScraper(BaseScraper):
-#     """Scraper for cryptocurrency data"""
-    
-#     def __init__(self):
-#         super().__init__(name="CryptoScraper")
-        
-#         # Mock cryptocurrency data
-#         self.crypto_data = {
-#             "bitcoin": {
-#                 "symbol": "BTC",
-#                 "price": "$45,000",
-#                 "change": "+2.5%",
-#                 "market_cap": "$882B"
-#             },
-#             "ethereum": {
-#                 "symbol": "ETH",
-#                 "price": "$2,500",
-#                 "change": "+1.8%",
-#                 "market_cap": "$301B"
-#             },
-#             "cardano": {
-#                 "symbol": "ADA",
-#                 "price": "$0.80",
-#                 "change": "+0.5%",
-#                 "market_cap": "$28B"
-#             },
-#             "ripple": {
-#                 "symbol": "XRP",
-#                 "price": "$2.10",
-#                 "change": "+3.2%",
-#                 "market_cap": "$114B"
-#             }
-#         }
-    
-#     def fetch(self, query: str) -> dict:
-#         """Fetch cryptocurrency data"""
-#         if not self.validate_query(query):
-#             return {"error": "Invalid query"}
-        
-#         query_lower = query.lower()
-        
-#         # Search in data
-#         for crypto, data in self.crypto_data.items():
-#             if query_lower in crypto.lower():
-#                 logger.info(f"Found cryptocurrency data for {query}")
-#                 return {
-#                     "query": query,
-#                     "results": data,
-#                     "success": True
-#                 }
-        
-#         logger.warning(f"No data found for {query}")
-#         return {
-#             "query": query,
-#             "results": "Not found",
-#             "success": False
-#         }
-    
-#     def fetch_prices(self, queries: list) -> dict:
-#         """Fetch prices for multiple cryptocurrencies"""
-#         results = {}
-#         for query in queries:
-#             data = self.fetch(query)
-#             results[query] = data.get('results', {})
-        
-#         return results
-    
-#     def fetch_trending(self) -> dict:
-#         """Get trending cryptocurrencies"""
-#         return {
-#             "trending": list(self.crypto_data.keys()),
-#             "success": True
-#         }
\ No newline at end of file
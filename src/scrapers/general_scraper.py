@@ -1,40 +1,57 @@
 import logging
 import requests
+from typing import Optional
 from .base_scraper import BaseScraper
+from src.utils import json_utils
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Punctuation dropped from queries before the local lookup, removed in one C-level pass
+_STRIP_PUNCT = str.maketrans('', '', '.?')
+
 
 class GeneralScraper(BaseScraper):
     """Scraper for general information from Wikipedia"""
     
-    def __init__(self):
-        super().__init__(name="GeneralScraper")
+    __slots__ = ('base_url', '_cache')
+    
+    # How ResearchAgent calls this scraper (fetch_general)
+    fetch_kind = 'general'
+    
+    # Seconds a Wikipedia summary is reused (summaries rarely change)
+    SUMMARY_TTL = 86400
+    
+    # Local database for faster queries (built once, shared by all instances)
+    general_data = {
+        "ai": {
+            "title": "Artificial Intelligence (AI)",
+            "description": "Artificial Intelligence is the simulation of human intelligence processes by computer systems. AI involves developing algorithms and models that enable machines to learn from data, recognize patterns, understand language, and make decisions without explicit human instruction.",
+            "applications": ["Machine Learning", "Computer Vision", "Natural Language Processing", "Robotics"],
+            "examples": ["ChatGPT", "Tesla Autopilot", "Netflix Recommendations"]
+        },
+        "machine learning": {
+            "title": "Machine Learning (ML)",
+            "description": "Machine Learning is a subset of AI that enables computer systems to learn from experience without being explicitly programmed. ML algorithms process data to identify patterns and make predictions.",
+            "types": ["Supervised Learning", "Unsupervised Learning", "Reinforcement Learning"],
+            "applications": ["Image Recognition", "Fraud Detection", "Recommendation Systems"]
+        },
+        "python": {
+            "title": "Python Programming Language",
+            "description": "Python is a high-level programming language known for its simplicity and versatility. It has become the standard language for AI and data science.",
+            "libraries": ["NumPy", "Pandas", "TensorFlow", "PyTorch"],
+            "use_cases": ["Data Analysis", "Machine Learning", "Web Development"]
+        }
+    }
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        super().__init__(name="GeneralScraper", session=session)
         
         # Wikipedia API endpoint
         self.base_url = "https://en.wikipedia.org/api/rest_v1/page/summary"
         
-        # Local database for faster queries
-        self.general_data = {
-            "ai": {
-                "title": "Artificial Intelligence (AI)",
-                "description": "Artificial Intelligence is the simulation of human intelligence processes by computer systems. AI involves developing algorithms and models that enable machines to learn from data, recognize patterns, understand language, and make decisions without explicit human instruction.",
-                "applications": ["Machine Learning", "Computer Vision", "Natural Language Processing", "Robotics"],
-                "examples": ["ChatGPT", "Tesla Autopilot", "Netflix Recommendations"]
-            },
-            "machine learning": {
-                "title": "Machine Learning (ML)",
-                "description": "Machine Learning is a subset of AI that enables computer systems to learn from experience without being explicitly programmed. ML algorithms process data to identify patterns and make predictions.",
-                "types": ["Supervised Learning", "Unsupervised Learning", "Reinforcement Learning"],
-                "applications": ["Image Recognition", "Fraud Detection", "Recommendation Systems"]
-            },
-            "python": {
-                "title": "Python Programming Language",
-                "description": "Python is a high-level programming language known for its simplicity and versatility. It has become the standard language for AI and data science.",
-                "libraries": ["NumPy", "Pandas", "TensorFlow", "PyTorch"],
-                "use_cases": ["Data Analysis", "Machine Learning", "Web Development"]
-            }
-        }
+        # Wikipedia summaries by page title (only successful lookups are cached)
+        self._cache = TTLCache(default_ttl=self.SUMMARY_TTL, max_size=256)
         
         logger.info("GeneralScraper Initialized")
     
@@ -48,12 +65,12 @@ class GeneralScraper(BaseScraper):
         try:
             # First try local database
             query_lower = query.lower()
-            query_clean = query_lower.replace(".", "").replace("?", "").strip()
+            query_clean = query_lower.translate(_STRIP_PUNCT).strip()
             
             # Search in local data
             for topic, info in self.general_data.items():
                 if topic in query_clean or query_clean in topic:
-                    logger.info(f"Found information in local database for {query}")
+                    logger.debug("Found information in local database for %s", query)
                     return {
                         "query": query,
                         "info": info,
@@ -63,17 +80,26 @@ class GeneralScraper(BaseScraper):
             
             # If not found locally, try Wikipedia
             formatted_query = query.replace(" ", "_")
+            # Callers get their own copy so editing a result can't change the cached one
+            cached = self._cache.get(formatted_query)
+            if cached is not None:
+                return dict(cached)
+            
             url = f"{self.base_url}/{formatted_query}"
             
-            logger.info(f"Fetching Wikipedia info for '{query}'...")
-            response = requests.get(url, timeout=5)
+            logger.debug("Fetching Wikipedia info for '%s'...", query)
+            response = self.session.get(url, headers=self._request_headers(), timeout=5)
             response.raise_for_status()
             
             # Parse the response
-            return self.parse_data(response)
+            formatted_response = self.parse_data(response)
+            if formatted_response.get("success"):
+                self._cache.set(formatted_query, formatted_response)
+                return dict(formatted_response)
+            return formatted_response
         
         except Exception as e:
-            logger.error(f"Error: {e}")
+            logger.error("Error: %s", e)
             return {"error": str(e), "success": False}
     
     # ==================== ABSTRACT METHOD 2: PARSE_DATA ====================
@@ -81,7 +107,7 @@ class GeneralScraper(BaseScraper):
     def parse_data(self, response: requests.Response) -> dict:
 
         try:
-            data = response.json()
+            data = json_utils.loads(response.content)
             
             if "error" in data:
                 return {
@@ -98,11 +124,11 @@ class GeneralScraper(BaseScraper):
                 "success": True
             }
             
-            logger.info(f"Parsed Wikipedia info")
+            logger.debug("Parsed Wikipedia info")
             return formatted_response
         
         except Exception as e:
-            logger.error(f"Error parsing data: {e}")
+            logger.error("Error parsing data: %s", e)
             return {"error": str(e), "success": False}
     
     # ==================== CONVENIENCE METHODS ====================
@@ -1,26 +1,81 @@
 """Real news scraper using NewsAPI"""
 
 from __future__ import annotations
+import asyncio
 import os
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional
 import logging
-from datetime import datetime
-from .base_scraper import BaseScraper
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+from .base_scraper import BaseScraper, format_ts
+from src.utils import json_utils
+from src.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# Load .env from project root once per process, not per scraper
+load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
+
+# Most NewsAPI requests fetch_multiple_queries has in flight at once (well under the session's pool size)
+MAX_PARALLEL_QUERIES = 8
+
+# Articles a scraper keeps for get_summary; the oldest are dropped beyond this
+MAX_STORED_ARTICLES = 1000
+
+# ==================== ARTICLE ====================
+
+@dataclass(slots=True, frozen=True)
+class Article:
+    """One stored news article (fixed slots instead of a dict per article)"""
+    title: str
+    description: Optional[str]
+    content: str
+    source: str
+    author: Optional[str]
+    url: str
+    published_at: str
+    image_url: Optional[str]
+    scraped_at_ns: int
+    # Words in description + content, counted once at parse time for get_summary (not serialized)
+    word_count: int = field(default=0, compare=False)
+    
+    def to_dict(self) -> dict:
+        """Serialize for API responses"""
+        return {name: getattr(self, name) for name in _ARTICLE_FIELDS}
+
+
+# Fields of Article that go into API responses
+_ARTICLE_FIELDS = tuple(name for name in Article.__slots__ if name != "word_count")
+
 
 class NewsScraper(BaseScraper):
     
-    def __init__(self):
-        super().__init__(name="NewsScraper")
-        from dotenv import load_dotenv
-        from pathlib import Path
-        # Load .env from project root
-        env_path = Path(__file__).parent.parent.parent / ".env"
-        load_dotenv(dotenv_path=env_path)
+    __slots__ = ('api_key', 'base_url', 'articles', '_cache', '_etags')
+    
+    # How ResearchAgent calls this scraper (fetch_article)
+    fetch_kind = 'article'
+    
+    # Seconds a query's parsed articles are reused before asking NewsAPI again
+    NEWS_TTL = 300
+    
+    # Seconds an ETag (and the result it validates) is kept for conditional requests
+    ETAG_TTL = 86400
+    
+    # Request parameters that are the same for every query (part of the cache key)
+    PAGE_SIZE = 5
+    LANGUAGE = "en"
+    _BASE_PARAMS = MappingProxyType({"sortBy": "publishedAt", "language": LANGUAGE, "pageSize": PAGE_SIZE})
+    
+    def __init__(self, session: Optional[requests.Session] = None):
+        super().__init__(name="NewsScraper", session=session)
         
-        # Get API key from environment variable
+        # Get API key from environment variable (.env is loaded once, at import)
         self.api_key = os.getenv("NEWS_API_KEY")
         
         if not self.api_key:
@@ -29,8 +84,17 @@ class NewsScraper(BaseScraper):
         # NewsAPI endpoint
         self.base_url = "https://newsapi.org/v2/everything"
         
-        # Store articles (FIX: was self.article, now self.articles)
-        self.articles = []
+        # Store articles (FIX: was self.article, now self.articles) as compact Article records,
+        # bounded so a long-running agent doesn't grow without limit; each record carries
+        # its own word count, so eviction can't separate an article from its count
+        self.articles = deque(maxlen=MAX_STORED_ARTICLES)
+        
+        # Parsed responses by (query, page size, language), articles kept as Article records;
+        # only successful fetches are cached
+        self._cache = TTLCache(default_ttl=self.NEWS_TTL, max_size=256)
+        
+        # (ETag, cached result) by the same key, so an expired entry can be revalidated with a 304
+        self._etags = TTLCache(default_ttl=self.ETAG_TTL, max_size=256)
         
         logger.info("News Scraper Initialized with NewsAPI")
     
@@ -55,25 +119,41 @@ class NewsScraper(BaseScraper):
                 "success": False
             }
         
+        cache_key = (query.lower().strip(), self.PAGE_SIZE, self.LANGUAGE)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            # Fresh dicts from the frozen records, so callers can't change the cached result
+            return {**cached, "articles": [article.to_dict() for article in cached["articles"]]}
+        
         try:
-            logger.info(f"Fetching news for: {query}")
+            logger.debug("Fetching news for: %s", query)
             
-            params = {
-                "q": query,
-                "sortBy": "publishedAt",
-                "language": "en",
-                "pageSize": 5,
-                "apiKey": self.api_key
-            }
+            params = {**self._BASE_PARAMS, "q": query, "apiKey": self.api_key}
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            # Ask NewsAPI to skip the body if nothing changed since the last response
+            validated = self._etags.get(cache_key)
+            headers = self._request_headers({"If-None-Match": validated[0]} if validated else None)
+            
+            response = self.session.get(self.base_url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
             
+            if response.status_code == 304 and validated:
+                logger.debug("News for %s not modified", query)
+                self._cache.set(cache_key, validated[1])
+                return {**validated[1], "articles": [article.to_dict() for article in validated[1]["articles"]]}
+            
             # Parse the response
-            return self.parse_data(response)
+            result = self.parse_data(response)
+            if result.get("success"):
+                stored = {**result, "articles": tuple(Article(**article) for article in result["articles"])}
+                self._cache.set(cache_key, stored)
+                etag = response.headers.get("ETag")
+                if etag:
+                    self._etags.set(cache_key, (etag, stored))
+            return result
         
         except Exception as e:
-            logger.error(f"Error: {e}")
+            logger.error("Error: %s", e)
             return {"error": str(e), "success": False}
     
     # ==================== ABSTRACT METHOD 2: PARSE_DATA ====================
@@ -91,51 +171,62 @@ class NewsScraper(BaseScraper):
             dict: Parsed news data
         """
         try:
-            data = response.json()
+            data = json_utils.loads(response.content)
             
             # Check for API errors
             if data.get("status") == "error":
                 error_msg = data.get("message", "Unknown error")
-                logger.error(f"NewsAPI error: {error_msg}")
+                logger.error("NewsAPI error: %s", error_msg)
                 return {
                     "error": f"NewsAPI Error: {error_msg}",
                     "success": False
                 }
             
-            # Format articles
-            articles = []
-            for article in data.get("articles", []):
-                formatted_article = {
-                    "title": article.get("title", "N/A"),
-                    "description": article.get("description", "N/A"),
-                    "content": article.get("content", "")[:500],
-                    "source": article.get("source", {}).get("name", "Unknown"),
-                    "author": article.get("author", "Unknown"),
-                    "url": article.get("url", "#"),
-                    "published_at": article.get("publishedAt", "N/A"),
-                    "image_url": article.get("urlToImage", ""),
-                    "scraped_at": datetime.now().isoformat()
-                }
-                
-                if self.validate_data(formatted_article):
-                    articles.append(formatted_article)
-                    self.articles.append(formatted_article)
+            # Format and validate the whole batch, then store it in one go
+            # (one timestamp for the whole response; see format_ts for display)
+            scraped_at_ns = time.time_ns()
+            articles = [self._format_article(article, scraped_at_ns) for article in data.get("articles", [])]
+            articles = [article for article in articles if self.validate_data(article)]
+            self.articles.extend(
+                Article(
+                    **article,
+                    word_count=len((article["description"] or "").split()) + len((article["content"] or "").split())
+                )
+                for article in articles
+            )
             
             result = {
                 "articles": articles,
                 "total_results": len(articles),
                 "source": "NewsAPI",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": format_ts(scraped_at_ns),
                 "success": True
             }
             
-            logger.info(f"Parsed {len(articles)} articles")
+            logger.debug("Parsed %d articles", len(articles))
             return result
         
         except Exception as e:
-            logger.error(f"Error parsing data: {e}")
+            logger.error("Error parsing data: %s", e)
             return {"error": str(e), "success": False}
     
+    @staticmethod
+    def _format_article(article: dict, scraped_at_ns: int) -> dict:
+        """Keep the fields we use from one NewsAPI article"""
+        # Bound once per article; NewsAPI sends null for missing content/source
+        get = article.get
+        return {
+            "title": get("title", "N/A"),
+            "description": get("description", "N/A"),
+            "content": (get("content") or "")[:500],
+            "source": (get("source") or {}).get("name", "Unknown"),
+            "author": get("author", "Unknown"),
+            "url": get("url", "#"),
+            "published_at": get("publishedAt", "N/A"),
+            "image_url": get("urlToImage", ""),
+            "scraped_at_ns": scraped_at_ns
+        }
+    
     # ==================== CONVENIENCE METHODS ====================
     
     def fetch_article(self, query: str) -> dict:
@@ -144,10 +235,24 @@ class NewsScraper(BaseScraper):
     
     def fetch_multiple_queries(self, queries: list) -> dict:
         #Fetch articles for multiple queries
-        results = {}
-        for query in queries:
-            results[query] = self.fetch(query)
-        return results
+        #NewsAPI takes one query per request, so the requests run side by side on the pooled session
+        if len(queries) <= 1:
+            return {query: self.fetch(query) for query in queries}
+        
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_QUERIES, len(queries))) as executor:
+            return dict(zip(queries, executor.map(self.fetch, queries)))
+    
+    async def afetch_multiple_queries(self, queries: list) -> dict:
+        #Async fetch_multiple_queries: the blocking requests run in worker threads,
+        #at most MAX_PARALLEL_QUERIES at a time, so the event loop stays free
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_QUERIES)
+        
+        async def fetch_one(query):
+            async with semaphore:
+                return await asyncio.to_thread(self.fetch, query)
+        
+        results = await asyncio.gather(*(fetch_one(query) for query in queries))
+        return dict(zip(queries, results))
     
     def get_summary(self) -> dict:
        #Get summary of scraped articles
@@ -161,17 +266,13 @@ class NewsScraper(BaseScraper):
                 "articles": []
             }
         
-        total_words = sum(
-            len(article.get("description", "").split()) + 
-            len(article.get("content", "").split())
-            for article in self.articles
-        )
+        total_words = sum(article.word_count for article in self.articles)
         
         return {
             "total_articles": total_articles,
             "total_words": total_words,
             "average_words_per_article": total_words // total_articles if total_articles > 0 else 0,
-            "articles": self.articles
+            "articles": [article.to_dict() for article in self.articles]
         }
     
     def validate_data(self, article: dict) -> bool:
@@ -179,103 +280,6 @@ class NewsScraper(BaseScraper):
         if not article:
             return False
         
-        if not article.get("title") or not article.get("url"):
-            return False
-        
-        if not article.get("description") and not article.get("content"):
-            return False
-        
-        return True
-
-# """News scraper"""
-
-# import logging
-# from .base_scraper import BaseScraper
-
-# logger = logging.getLogger(__name__)
-
-
-# class NewsScraper(BaseScraper):
-#     """Scraper for news articles"""
-    
-#     def __init__(self):
-#         super().__init__(name="NewsScraper")
-        
-#         # Mock news data
-#         self.news_data = {
-#             "ai": [
-#                 {
-#                     "title": "AI Breakthroughs in 2024",
-#                     "content": "Recent advancements in artificial intelligence...",
-#                     "source": "TechNews",
-#                     "date": "2024-02-09"
-#                 },
-#                 {
-#                     "title": "Machine Learning Applications",
-#                     "content": "How ML is transforming industries...",
-#                     "source": "AIDaily",
-#                     "date": "2024-02-08"
-#                 }
-#             ],
-#             "bitcoin": [
-#                 {
-#                     "title": "Bitcoin Price Surge",
-#                     "content": "Bitcoin hits new highs in recent trading...",
-#                     "source": "CryptoNews",
-#                     "date": "2024-02-09"
-#                 },
-#                 {
-#                     "title": "BTC Analysis",
-#                     "content": "Technical analysis shows strong momentum...",
-#                     "source": "BlockchainDaily",
-#                     "date": "2024-02-08"
-#                 }
-#             ]
-#         }
-    
-#     def fetch(self, query: str) -> dict:
-#         """Fetch news articles"""
-#         if not self.validate_query(query):
-#             return {"error": "Invalid query"}
-        
-#         query_lower = query.lower()
-        
-#         # Search in news data
-#         for topic, articles in self.news_data.items():
-#             if query_lower in topic.lower():
-#                 logger.info(f"Found articles for {query}")
-#                 return {
-#                     "query": query,
-#                     "articles": articles,
-#                     "count": len(articles),
-#                     "success": True
-#                 }
-        
-#         logger.warning(f"No articles found for {query}")
-#         return {
-#             "query": query,
-#             "articles": [],
-#             "count": 0,
-#             "success": False
-#         }
-    
-#     def fetch_article(self, query: str) -> dict:
-#         """Fetch single article"""
-#         return self.fetch(query)
-    
-#     def fetch_latest(self) -> dict:
-#         """Get latest news"""
-#         latest = []
-#         for topic, articles in self.news_data.items():
-#             if articles:
-#                 latest.append(articles[0])
-        
-#         return {
-#             "latest": latest,
-#             "success": True
-#         }
-
-
-
-
-
+        # Needs a title, a url and some text, checked in one short-circuiting expression
+        get = article.get
+        return bool(get("title") and get("url") and (get("description") or get("content")))
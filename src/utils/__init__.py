@@ -0,0 +1,9 @@
+"""Shared utilities"""
+
+from . import json_utils
+from .cache import TTLCache
+
+__all__ = [
+    'json_utils',
+    'TTLCache'
+]
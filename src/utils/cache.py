@@ -0,0 +1,57 @@
+"""Small in-process cache with per-entry expiry"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe dict cache whose entries expire after a time-to-live
+
+    Expired entries are dropped when they are read; when the cache is full
+    the oldest entry is evicted to make room.
+    """
+
+    def __init__(self, default_ttl: float = 60, max_size: int = 256):
+        """
+        Args:
+            default_ttl: Seconds an entry stays valid unless set() overrides it
+            max_size: Maximum number of entries kept
+        """
+        self.default_ttl = default_ttl
+        self.max_size = max_size
+        self._data = {}  # key -> (value, expires_at), in insertion order
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Cache a value for ttl seconds (default_ttl if None)"""
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            # Re-insert so a refreshed key counts as the newest
+            self._data.pop(key, None)
+            if len(self._data) >= self.max_size:
+                del self._data[next(iter(self._data))]
+            self._data[key] = (value, expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
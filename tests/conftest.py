@@ -0,0 +1,101 @@
+import pytest
+import requests
+import tracemalloc
+from unittest.mock import patch
+from requests.adapters import HTTPAdapter
+
+
+# Scripts that check real API keys/endpoints by hand (python -m tests.<name>).
+# They run at import, before no_network is active, so pytest never collects them
+collect_ignore = [
+    "test_crypto.py",
+    "test_env_loaded.py",
+    "test_news_scraper.py",
+    "test_openai_key.py",
+]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_network():
+    """
+    Fail every real HTTP request at once for the whole test session
+
+    Scrapers behave exactly as they do offline (a ConnectionError), without
+    waiting on DNS, timeouts or the session's retry backoff, and the
+    patch is set up once instead of per test.
+    """
+    patcher = patch.object(HTTPAdapter, "send", side_effect=requests.ConnectionError("network disabled in tests"))
+    patcher.start()
+    yield
+    patcher.stop()
+
+
+# ==================== MEMORY BUDGET ====================
+
+@pytest.fixture(scope="module", autouse=True)
+def module_memory_budget(request):
+    """
+    Fail a test module whose tests leave more than --memory-budget MiB allocated behind
+
+    Opt-in: tracemalloc records every allocation, which roughly doubles the
+    suite's run time, so it is only switched on when a budget is given.
+    """
+    budget = request.config.getoption("--memory-budget")
+    if not budget:
+        yield
+        return
+
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    yield
+    grown = tracemalloc.get_traced_memory()[0] - before
+    if started_here:
+        tracemalloc.stop()
+    if grown > budget * 2**20:
+        pytest.fail(f"{request.module.__name__} grew traced memory by {grown / 2**20:.1f} MiB")
+
+
+# ==================== SLOW TEST BUDGET ====================
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--memory-budget", type=float, default=0,
+        help="fail a test module that leaves more than this many MiB allocated behind (0 disables)"
+    )
+    parser.addoption(
+        "--slow-test-budget", type=float, default=0.5,
+        help="fail the run if a test body takes longer than this many seconds (0 disables)"
+    )
+
+
+# Tests over the budget as (duration, nodeid); the exit status and the summary both read it
+_slow_tests = []
+_slow_test_budget = 0.0
+
+
+def pytest_configure(config):
+    global _slow_test_budget
+    # xdist workers only report durations; the controller (or a serial run) checks them
+    if not hasattr(config, "workerinput"):
+        _slow_test_budget = config.getoption("--slow-test-budget")
+
+
+def pytest_runtest_logreport(report):
+    # Under xdist this runs on the controller too, fed by the workers' reports
+    if _slow_test_budget and report.when == "call" and report.duration > _slow_test_budget:
+        _slow_tests.append((report.duration, report.nodeid))
+
+
+def pytest_sessionfinish(session, exitstatus):
+    _slow_tests.sort(reverse=True)
+    if _slow_tests and exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if _slow_tests:
+        terminalreporter.section(f"tests over the {_slow_test_budget}s slow-test budget")
+        for duration, nodeid in _slow_tests:
+            terminalreporter.write_line(f"{duration:.2f}s {nodeid}")
@@ -0,0 +1,229 @@
+import pytest #testing framework
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from src.agents.base_agent import BaseAgent
+from src.scrapers.base_scraper import format_ts
+
+#import the API we are testing
+from backend import app as backend_app
+
+
+class FakeAgent(BaseAgent):
+    #agent that answers instantly instead of calling real scrapers
+    def run(self, task):
+        self.memory.set_task(task)
+        self.memory.record_tool_call('fake')
+        self.emit("tool_call", "Searching with the fake scraper...", task=task, tool_calls=1)
+        return {"query": task, "analysis": f"Findings for {task}", "success": True}
+
+
+#FIXTURES for test
+@pytest.fixture
+def client():
+    #fresh history for each test so results from one test don't leak into another
+    backend_app.STORE.clear()
+    return TestClient(backend_app.app)
+
+@pytest.fixture
+def saved_result(client):
+    #put one finished research result in history like the websocket handler does
+    entry = {
+        "query": "bitcoin",
+        "timestamp": "2024-02-16T12:30:00",
+        "findings": 'BITCOIN: $45,000, "up" today',
+        "memory": {}
+    }
+    backend_app.STORE.add(entry)
+    return entry
+
+
+#LOOKUP TESTS
+def test_get_result(client, saved_result):
+
+    response = client.get(f"/results/{saved_result['id']}")
+
+    assert response.status_code == 200
+    assert response.json()["query"] == "bitcoin"
+
+def test_delete_result(client, saved_result):
+
+    result_id = saved_result['id']
+    response = client.delete(f"/results/{result_id}")
+
+    assert response.status_code == 200
+    assert client.get(f"/results/{result_id}").status_code == 404
+    assert client.get("/history").json()["count"] == 0
+
+def test_delete_missing_result(client):
+
+    response = client.delete("/results/99")
+
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    #swap the real agent pool for one that builds FakeAgents
+    pool = backend_app.AgentPool(FakeAgent)
+    monkeypatch.setattr(backend_app, "AGENT_POOL", pool)
+    return pool
+
+
+#WEBSOCKET TESTS
+def test_websocket_research(client, fake_pool):
+
+    with client.websocket_connect("/ws/research") as websocket:
+        websocket.send_json({"query": "bitcoin"})
+
+        messages = [websocket.receive_json()]
+        while messages[-1]["status"] not in ("completed", "error"):
+            messages.append(websocket.receive_json())
+
+    assert messages[0]["status"] == "started"
+    assert messages[1]["status"] == "progress"
+    assert messages[1]["message"] == "Searching with the fake scraper..."
+    assert messages[1]["tool_calls"] == 1
+    assert messages[-1]["status"] == "completed"
+    assert messages[-1]["results"]["query"] == "bitcoin"
+    assert messages[-1]["memory"]["tool_calls"] == 1
+    assert client.get(f"/results/{messages[-1]['result_id']}").status_code == 200
+
+class PriceAgent(FakeAgent):
+    #returns a raw price record like CryptoScraper does
+    def run(self, task):
+        result = super().run(task)
+        result["scraped_data"] = {"bitcoin": {"crypto_id": "BITCOIN", "price_usd": 67012.123456, "success": True}}
+        return result
+
+def test_websocket_formats_prices(client, monkeypatch):
+    #the UI and the export get display strings, not raw floats
+    monkeypatch.setattr(backend_app, "AGENT_POOL", backend_app.AgentPool(PriceAgent))
+
+    with client.websocket_connect("/ws/research") as websocket:
+        websocket.send_json({"query": "bitcoin"})
+        message = websocket.receive_json()
+        while message["status"] not in ("completed", "error"):
+            message = websocket.receive_json()
+
+    assert message["results"]["scraped_data"]["bitcoin"]["price_usd"] == "$67,012.12"
+    assert "$67,012.12" in client.get(f"/results/{message['result_id']}").json()["findings"]
+
+class NewsAgent(FakeAgent):
+    #returns an article stamped like NewsScraper does
+    def run(self, task):
+        result = super().run(task)
+        result["scraped_data"] = {"articles": [{"title": "Bitcoin climbs", "scraped_at_ns": 1_760_000_000_123_456_789}]}
+        return result
+
+def test_websocket_formats_article_timestamps(client, monkeypatch):
+    #nanosecond ints are too big for JavaScript numbers, so the UI gets ISO strings
+    monkeypatch.setattr(backend_app, "AGENT_POOL", backend_app.AgentPool(NewsAgent))
+
+    with client.websocket_connect("/ws/research") as websocket:
+        websocket.send_json({"query": "bitcoin news"})
+        message = websocket.receive_json()
+        while message["status"] not in ("completed", "error"):
+            message = websocket.receive_json()
+
+    article = message["results"]["scraped_data"]["articles"][0]
+    assert "scraped_at_ns" not in article
+    assert article["scraped_at"] == format_ts(1_760_000_000_123_456_789)
+    assert article["scraped_at"].endswith(".123456")
+
+def test_websocket_invalid_json(client, fake_pool):
+    #a bad message gets an error reply and the connection stays usable
+    with client.websocket_connect("/ws/research") as websocket:
+        websocket.send_text("not json")
+        assert websocket.receive_json()["status"] == "error"
+
+        websocket.send_bytes(b'{"query": "bitcoin"}')
+        assert websocket.receive_json()["status"] == "started"
+
+def test_agent_pool_reuses_agents():
+
+    pool = backend_app.AgentPool(FakeAgent, max_idle=1)
+    agent = pool.acquire()
+    agent.run("bitcoin")
+    pool.release(agent)
+
+    assert pool.acquire() is agent
+    assert agent.memory.task is None #memory was reset on release
+
+
+class SlowAgent(FakeAgent):
+    #keeps working for a moment after its first progress event
+    finished = False
+
+    def run(self, task):
+        result = super().run(task)
+        time.sleep(0.05)
+        self.finished = True
+        return result
+
+class BrokenSocket:
+    #a client that went away: every send fails
+    async def send_text(self, text):
+        raise RuntimeError("client went away")
+
+def test_run_with_progress_waits_for_agent_when_send_fails():
+    #the agent must be done before the handler resets it and puts it back in the pool
+    agent = SlowAgent()
+
+    async def research():
+        with pytest.raises(RuntimeError):
+            await backend_app._run_with_progress(BrokenSocket(), agent, "bitcoin")
+        return agent.finished
+
+    assert asyncio.run(research())
+    assert agent.on_event is None
+
+
+#STORE TESTS
+def test_store_drops_oldest_when_full():
+
+    store = backend_app.ResultStore(max_size=2)
+    first = store.add({"query": "a"})
+    store.add({"query": "b"})
+    store.add({"query": "c"})
+
+    assert len(store) == 2
+    assert store.get(first) is None
+    assert [r["query"] for r in store.recent(10)] == ["c", "b"]
+
+
+#EXPORT TESTS
+def test_export_streams_csv(client, saved_result):
+
+    result_id = saved_result['id']
+    response = client.post(f"/export/{result_id}")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert f"research_{result_id}.csv" in response.headers["content-disposition"]
+
+    lines = response.text.splitlines()
+    assert lines[0] == "Query,Timestamp,Findings"
+    assert lines[1] == 'bitcoin,2024-02-16T12:30:00,"BITCOIN: $45,000, ""up"" today"'
+
+def test_export_missing_result(client):
+
+    response = client.post("/export/99")
+
+    assert response.status_code == 404
+
+
+#CORS TESTS
+def test_cors_preflight(client):
+
+    response = client.options("/results/1", headers={
+        "Origin": "http://localhost:3000",
+        "Access-Control-Request-Method": "DELETE"
+    })
+
+    assert response.status_code == 200
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.headers["access-control-max-age"] == "3600"
+    assert "access-control-allow-credentials" not in response.headers
@@ -1,21 +1,24 @@
 from src.scrapers.crypto_scraper import CryptoScraper
 
-# Create scraper
-scraper = CryptoScraper()
 
-# Test building URL
-url = scraper.build_price_url(['bitcoin', 'ethereum'], 'usd')
-print(f"Built URL: {url}")
+# Run by hand (python -m tests.test_crypto); importing it makes no API calls
+if __name__ == "__main__":
+    # Create scraper
+    scraper = CryptoScraper()
 
-# Test getting crypto data (REAL API CALL)
-print("\nFetching real cryptocurrency data...")
-result = scraper.fetch_prices(['bitcoin', 'ethereum', 'cardano'])
+    # Test building URL
+    url = scraper.build_price_url(['bitcoin', 'ethereum'], 'usd')
+    print(f"Built URL: {url}")
 
-if result:
-    print(f"\n✅ Successfully scraped data!")
-    print(f"Data: {result}")
-else:
-    print("\n❌ Failed to scrape")
+    # Test getting crypto data (REAL API CALL)
+    print("\nFetching real cryptocurrency data...")
+    result = scraper.fetch_prices(['bitcoin', 'ethereum', 'cardano'])
 
-# Get summary
-print(f"\nSummary: {scraper.summary()}")
\ No newline at end of file
+    if result:
+        print(f"\n✅ Successfully scraped data!")
+        print(f"Data: {result}")
+    else:
+        print("\n❌ Failed to scrape")
+
+    # Get summary
+    print(f"\nSummary: {scraper.summary()}")
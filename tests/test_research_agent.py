@@ -1,8 +1,30 @@
 import pytest #testing framework
+import asyncio
+from types import MappingProxyType
 
 from unittest.mock import Mock, patch, MagicMock
 #import the agent we are testing
 from src.agents.research_agent import ResearchAgent
+from src.agents.base_agent import Tool, Memory
+from src.scrapers.crypto_scraper import CryptoScraper
+
+
+#canned CoinGecko answer shared by every test, built once and read-only so no test can change it for the others
+CANNED_BITCOIN = MappingProxyType({
+    'bitcoin': MappingProxyType({
+        'price': 45000,
+        'currency': 'usd',
+        '24_change': 2.5,
+        'market_cap': 900000000000
+    })
+})
+
+#parsed tasks reused across tests (read-only like CANNED_BITCOIN)
+TASK_CRYPTO_BITCOIN = MappingProxyType({'type': 'crypto', 'query': 'bitcoin'})
+TASK_NEWS_AI = MappingProxyType({'type': 'news', 'query': 'ai news'})
+
+#stands in for a scraper with no recognized fetch method
+_MISSING_SCRAPER = object()
 
 
 #FIXTURES for test
@@ -28,18 +50,10 @@ def research_agent():
 
 @pytest.fixture
 def mock_crypto_scraper():
-    mock_scraper = MagicMock()
-
-    mock_scraper.fetch_prices = MagicMock(
-        return_value = {
-            'bitcoin':{
-                'price': 45000,
-                'currency': 'usd',
-                '24_change': 2.5,
-                'market_cap': 900000000000
-            }
-        }
-    )
+    #spec'd Mock: only CryptoScraper's attributes exist, and no magic methods are set up
+    mock_scraper = Mock(spec=CryptoScraper)
+
+    mock_scraper.fetch_prices.return_value = CANNED_BITCOIN
 
     return mock_scraper
 
@@ -60,78 +74,76 @@ def test_research_agent_initialization(research_agent):
 
     assert len(research_agent.scraper_tools) == 0 #Check scraper dict is empty at start
 
-def test_register_scraper(research_agent, mock_crypto_scraper):
-    
-    research_agent.register_scraper('crypto', mock_crypto_scraper)
-
-    assert 'crypto' in research_agent.scraper_tools
-
-    assert research_agent.scraper_tools['crypto'] == mock_crypto_scraper
-
-#TASK PARSING TEST
-def test_parse_task_bitcoin(research_agent):
-    #here we parse the bitcoin task works
+def test_shared_session_reaches_scrapers():
+    #one session passed to the agent is reused by every default scraper
+    session = MagicMock()
+    agent = ResearchAgent(session=session)
 
-    parsed = research_agent._parse_task("Research Bitcoin Price")
+    assert all(scraper.session is session for scraper in agent.scraper_tools.values())
 
-    assert parsed['query'] == 'bitcoin' 
-    assert parsed['type'] == 'crypto'
+def test_default_scrapers_share_a_session(research_agent):
+    #without a session passed in, every scraper reuses the process-wide one
+    sessions = {id(scraper.session) for scraper in research_agent.scraper_tools.values()}
 
-def test_parse_task_news(research_agent):
-    #parsing news task work
+    assert len(sessions) == 1
 
-    parsed = research_agent._parse_task("Get latest A.I News")
+def test_shared_session_pooled_by_retries():
+    from src.scrapers.base_scraper import shared_session
 
-    assert parsed['query'] == 'news'
-    assert parsed['type'] == 'news'
+    assert shared_session(5) is shared_session(5)
+    assert shared_session(5) is not shared_session()
 
-def test_parse_task_invalid(research_agent):
+def test_register_scraper(research_agent, mock_crypto_scraper):
     
-    parsed = research_agent._parse_task(None) #we passed nothing means Invalid
+    research_agent.register_scraper('crypto', mock_crypto_scraper)
+
+    assert 'crypto' in research_agent.scraper_tools
 
-    assert parsed == {} #it will return empty dict
+    assert research_agent.scraper_tools['crypto'] == mock_crypto_scraper
 
-    parsed = research_agent._parse_task("") #empty string also invalid
+#TASK PARSING TEST
+#one table instead of a function per case; invalid tasks (None or empty) give an empty dict
+@pytest.mark.parametrize("task,expected", [
+    ("Research Bitcoin Price", {'query': 'bitcoin', 'type': 'crypto'}),
+    ("Get latest A.I News", {'query': 'news', 'type': 'news'}),
+    (None, {}),
+    ("", {}),
+])
+def test_parse_task(task, expected):
+    #_parse_task is a staticmethod, so no agent is built for these
+    parsed = ResearchAgent._parse_task(task)
 
-    assert parsed == {}
+    assert {key: parsed.get(key) for key in expected} == expected
+    assert bool(parsed) == bool(expected)
 
 
 #AGENT DECISION TEST
 #Agent must decide correct scraper to use
-def test_decide_scraper_crypto(research_agent):
-
-    #task parsed as crypto
-    task = {'type': 'crypto', 'query': 'bitcoin'}
-
-    scraper_name = research_agent._decide_scraper(task)
-    assert scraper_name == 'crypto'
+@pytest.mark.parametrize("task,expected", [
+    (TASK_CRYPTO_BITCOIN, 'crypto'),
+    (TASK_NEWS_AI, 'news'),
+])
+def test_decide_scraper(research_agent, task, expected):
+    #one row per task type; a new scraper type only needs a new row
 
-def test_decide_scraper_news(research_agent):
-
-    task = {'type': 'news', 'query': 'ai news'}
-
-    scraper_name = research_agent._decide_scraper(task)
-    assert scraper_name == 'news'
+    assert research_agent._decide_scraper(task) == expected
 
 
 #SCRAPER EXECUTION TEST
 #test to check if the agent can execute or call the crypto scrapper
 def test_execute_scraper_with_crypto(agent_with_scraper):
-    task = {'type': 'crypto', 'query': 'bitcoin'}
 
     scraper = agent_with_scraper.scraper_tools['crypto']
-    data = agent_with_scraper._execute_scraper(scraper, task)
+    data = agent_with_scraper._execute_scraper(scraper, TASK_CRYPTO_BITCOIN)
 
     assert data is not None
     assert 'bitcoin' in data
 
 def test_execute_scraper_notfound(research_agent):
-    
-    task = {'type': 'crypto', 'query': 'bitcoin'}
-    fake_scraper = MagicMock()
+    #a plain object has none of the fetch methods, so there is nothing to call
+    result = research_agent._execute_scraper(_MISSING_SCRAPER, TASK_CRYPTO_BITCOIN)
 
-    result = research_agent._execute_scraper(fake_scraper, task)
-    assert result is not None
+    assert result is None
 
 #DATA TEST ANALYSIS
 def test_analyze_data_with_crypto(research_agent):
@@ -155,23 +167,6 @@ def test_analyze_data_empty(research_agent):
     assert 'No Data' in analysis
 
 
-#FULL INTEGRATION TEST
-def test_full_research_flow(agent_with_scraper): #testing entire work flow 
-    
-    result = agent_with_scraper.run("Research Bitcoin")
-
-    assert result['success'] == True
-    assert result['query'] == 'bitcoin'
-    assert 'analysis' in result
-    assert 'scraped_data' in result
-
-def test_full_research_missing_scrapper(research_agent):
-
-    result = research_agent.run("Research Bitcoin")
-    
-    assert result['success'] == False
-    assert 'error' in result
-
 def test_research_history(agent_with_scraper):
 
     assert len(agent_with_scraper.get_research_history()) == 0
@@ -208,8 +203,23 @@ def test_memory_tracking(agent_with_scraper):
 
     memory = agent_with_scraper.memory.get_summary()
     assert memory['task'] == "Research Bitcoin"
+
+    history = agent_with_scraper.memory.get_history(iso=True)
+    assert history[0]['type'] == 'task'
+    assert history[0]['content'] == "Research Bitcoin"
+    assert 'timestamp' in history[0]
     #assert memory['tool_call'] > 0 error line will look later when we implement tool call tracking in memory
 
+def test_progress_events(agent_with_scraper):
+    #every step of a run is reported to the on_event callback
+    events = []
+    agent_with_scraper.on_event = events.append
+
+    agent_with_scraper.run("Research Bitcoin")
+
+    assert [e['type'] for e in events] == ['task', 'thought', 'tool_call', 'analysis']
+    assert events[2]['tool'] == 'crypto'
+
 #ERROR HANDLING TEST
 def test_scraper_return_none(research_agent):
     #scraper might return None
@@ -225,3 +235,176 @@ def test_scraper_return_none(research_agent):
 
 
 
+
+
+#ASYNC / PARALLEL RUN TEST
+def test_split_task(research_agent):
+
+    assert research_agent.split_task("Research Bitcoin") == ["Research Bitcoin"]
+    assert research_agent.split_task("bitcoin price; AI news") == ["bitcoin price", "AI news"]
+
+def test_run_async_single_task(agent_with_scraper):
+
+    result = asyncio.run(agent_with_scraper.run_async("Research Bitcoin"))
+
+    assert result['success'] == True
+    assert result['query'] == 'bitcoin'
+
+def test_run_async_sub_tasks(agent_with_scraper):
+    #each ';' separated part runs as its own research
+    result = asyncio.run(agent_with_scraper.run_async("Research Bitcoin; BTC price"))
+
+    assert result['success'] == True
+    assert len(result['results']) == 2
+    assert len(agent_with_scraper.get_research_history()) == 2
+
+def test_run_async_sub_tasks_keep_whole_task(agent_with_scraper):
+    #sub-tasks share one memory, so the task is the whole query, recorded once
+    asyncio.run(agent_with_scraper.run_async("Research Bitcoin; BTC price"))
+
+    history = agent_with_scraper.memory.get_history()
+    assert agent_with_scraper.memory.task == "Research Bitcoin; BTC price"
+    assert [e['content'] for e in history if e['type'] == 'task'] == ["Research Bitcoin; BTC price"]
+
+def test_run_many(agent_with_scraper):
+    #a batch of tasks comes back in order, one result per task
+    results = asyncio.run(agent_with_scraper.run_many(["Research Bitcoin", "", "BTC price"]))
+
+    assert [r['success'] for r in results] == [True, False, True]
+
+def test_run_many_records_batch_task(agent_with_scraper):
+    #the batch replaces the previous task in memory, recorded once
+    agent_with_scraper.run("Research Bitcoin")
+    asyncio.run(agent_with_scraper.run_many(["machine learning", "python"]))
+
+    tasks = [e['content'] for e in agent_with_scraper.memory.get_history() if e['type'] == 'task']
+    assert agent_with_scraper.memory.get_summary()['task'] == "machine learning; python"
+    assert tasks == ["Research Bitcoin", "machine learning; python"]
+
+#TOOL REGISTRY TEST
+def test_tools_keyed_by_name(research_agent):
+
+    tool = Tool(name='echo', description='Returns its input', function=lambda x: x)
+    research_agent.add_tool(tool)
+
+    assert research_agent.get_tool('echo') is tool
+    assert research_agent.get_tool('missing') is None
+    assert research_agent.get_tools() == [tool]
+
+def test_decide_tool(research_agent):
+
+    assert research_agent.decide_tool("Scrape the CoinGecko page") == 'scrape_website'
+    assert research_agent.decide_tool("please SUMMARIZE this") == 'summarize'
+    assert research_agent.decide_tool("look at the analyzer") is None #no tools, no whole-word match
+
+def test_tool_to_dict():
+
+    tool = Tool(name='echo', description='Returns its input', function=lambda x: x)
+
+    assert tool('hi') == 'hi'
+    assert tool.to_dict() == {'name': 'echo', 'description': 'Returns its input', 'parameters': {}}
+    assert tool.to_dict() is tool.to_dict() #built once
+
+def test_memory_history_is_bounded():
+
+    memory = Memory(max_history=3)
+    for i in range(5):
+        memory.add_thoughts(f"thought {i}")
+
+    assert [e['content'] for e in memory.get_history()] == ["thought 2", "thought 3", "thought 4"]
+    assert memory.get_summary()['history_length'] == 3
+
+def test_memory_tools_used():
+
+    memory = Memory()
+    for tool in ('crypto', 'news', 'crypto'):
+        memory.record_tool_call(tool)
+
+    summary = memory.get_summary()
+    assert summary['tool_calls'] == 3
+    assert sorted(summary['tools_used']) == ['crypto', 'news']
+
+    memory.clear()
+    assert memory.get_summary()['tools_used'] == []
+
+#CACHING TEST
+def test_repeat_query_reaches_scraper(agent_with_scraper, mock_crypto_scraper):
+    #the agent keeps no cache of its own; scrapers decide how long data stays fresh
+    first = agent_with_scraper.run("Research Bitcoin")
+    second = agent_with_scraper.run("BTC price today")
+
+    assert mock_crypto_scraper.fetch_prices.call_count == 2
+    assert second['scraped_data'] == first['scraped_data']
+    assert "BTC price today" in second['analysis']
+
+def test_parse_task_crypto_wins_over_news():
+
+    assert ResearchAgent._parse_task("Latest news about BTC")['type'] == 'crypto'
+    assert ResearchAgent._parse_task("Read this ARTICLE")['type'] == 'news'
+    assert ResearchAgent._parse_task("Machine learning")['type'] == 'general'
+
+def test_execute_scraper_uses_fetch_kind(research_agent):
+    #fetch_kind picks the method even when the scraper has several
+    scraper = MagicMock()
+    scraper.fetch_kind = 'article'
+
+    research_agent._execute_scraper(scraper, TASK_NEWS_AI)
+
+    scraper.fetch_article.assert_called_once_with('ai news')
+    scraper.fetch_prices.assert_not_called()
+
+def test_agent_has_no_instance_dict(research_agent):
+
+    assert not hasattr(research_agent, '__dict__')
+    assert not any(hasattr(scraper, '__dict__') for scraper in research_agent.scraper_tools.values())
+    with pytest.raises(AttributeError):
+        research_agent.typo_attribute = 1
+
+def test_research_history_rows(agent_with_scraper):
+
+    result = agent_with_scraper.run("Research Bitcoin")
+
+    assert agent_with_scraper.get_research_history() == [result]
+    assert list(agent_with_scraper.get_queries()) == ['bitcoin']
+
+    agent_with_scraper.clear_history()
+    assert agent_with_scraper.get_research_summary()['total_research'] == 0
+
+def test_parse_task_returns_fresh_dict():
+    #the parse is cached but callers can still change their own dict
+    first = ResearchAgent._parse_task("Research Bitcoin")
+    first['query'] = 'changed'
+
+    assert ResearchAgent._parse_task("Research Bitcoin")['query'] == 'bitcoin'
+
+def test_analysis_formats_raw_prices(research_agent):
+    #scrapers keep numbers; the analysis shows them as money
+    data = {'bitcoin': {'crypto_id': 'BITCOIN', 'price_usd': 45000.0, '24h_change_percent': 2.513}}
+
+    analysis = research_agent._analyze_data(data, {'type': 'crypto', 'topic': 'Bitcoin'})
+
+    assert "'price_usd': '$45,000.00'" in analysis
+    assert "'24h_change_percent': '2.51%'" in analysis
+
+
+#FULL INTEGRATION TEST
+#slowest tests run last so a broken unit test fails the run first (see pytest -x)
+@pytest.mark.integration
+def test_full_research_flow(agent_with_scraper): #testing entire work flow 
+    
+    result = agent_with_scraper.run("Research Bitcoin")
+
+    assert result['success'] == True
+    assert result['query'] == 'bitcoin'
+    assert 'analysis' in result
+    assert 'scraped_data' in result
+
+@pytest.mark.integration
+def test_full_research_missing_scrapper(research_agent):
+    #the agent registers default scrapers, so remove them to get the "no scraper" case
+    research_agent.scraper_tools.clear()
+
+    result = research_agent.run("Research Bitcoin")
+    
+    assert result['success'] == False
+    assert 'error' in result
@@ -0,0 +1,283 @@
+import pytest #testing framework
+import asyncio
+import json
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from unittest.mock import Mock, patch
+#import the scrapers we are testing
+from src.scrapers.base_scraper import BaseScraper, DEFAULT_HEADERS, build_session
+from src.scrapers.crypto_scraper import CryptoScraper
+from src.scrapers.general_scraper import GeneralScraper
+from src.scrapers.news_scraper import NewsScraper
+from src.utils.cache import TTLCache
+
+
+class EchoScraper(BaseScraper):
+    #smallest concrete scraper, for testing BaseScraper's own methods
+    __slots__ = ()
+
+    def fetch(self, query):
+        return {"query": query}
+
+    def parse_data(self, response):
+        return {}
+
+
+#FIXTURES for test
+@pytest.fixture
+def fake_session():
+    #stands in for requests.Session; each test sets up the responses it needs
+    return Mock()
+
+@pytest.fixture
+def echo_scraper(fake_session):
+    return EchoScraper(session=fake_session)
+
+
+#SAVE / FLUSH TESTS
+def test_save_many_stamps_one_timestamp(echo_scraper):
+
+    records = [{"coin": "bitcoin"}, {"coin": "ethereum"}]
+    echo_scraper.save_many(records)
+
+    saved = echo_scraper.get_scraped_data()
+    assert [r["coin"] for r in saved] == ["bitcoin", "ethereum"]
+    assert saved[0]["scraped_at_ns"] == saved[1]["scraped_at_ns"]
+    assert "scraped_at_ns" not in records[0] #caller's dicts are left alone
+
+def test_flush_writes_json_lines(echo_scraper, tmp_path):
+
+    path = tmp_path / "scraped.jsonl"
+    echo_scraper.save_many([{"coin": "bitcoin"}, {"coin": "ethereum"}])
+
+    assert asyncio.run(echo_scraper.flush(str(path))) == 2
+    assert echo_scraper.get_scraped_data() == []
+    assert [json.loads(line)["coin"] for line in path.read_text().splitlines()] == ["bitcoin", "ethereum"]
+
+    #nothing stored, nothing written
+    assert asyncio.run(echo_scraper.flush(str(path))) == 0
+
+def test_flush_keeps_records_when_write_fails(echo_scraper, tmp_path):
+
+    echo_scraper.save_data({"coin": "bitcoin"})
+
+    with patch("src.scrapers.base_scraper._append_bytes", side_effect=OSError("disk full")):
+        with pytest.raises(OSError):
+            asyncio.run(echo_scraper.flush(str(tmp_path / "scraped.jsonl")))
+
+    assert [r["coin"] for r in echo_scraper.get_scraped_data()] == ["bitcoin"]
+
+
+#CRYPTO TESTS
+#CoinGecko /simple/price answer for bitcoin and ethereum
+PRICES_BODY = json.dumps({
+    "bitcoin": {"usd": 67012.5, "usd_market_cap": 1.3e12, "usd_24h_vol": 2.1e10, "usd_24h_change": 1.25},
+    "ethereum": {"usd": 3100.0, "usd_market_cap": 3.7e11, "usd_24h_vol": 1.0e10, "usd_24h_change": -0.5},
+}).encode()
+
+def fake_response(content=b"{}", status_code=200, headers=None):
+    #what the scrapers read from a requests.Response
+    response = Mock(content=content, status_code=status_code, headers=headers or {})
+    response.raise_for_status.return_value = None
+    return response
+
+@pytest.fixture
+def crypto_scraper(fake_session):
+    fake_session.get.return_value = fake_response(PRICES_BODY)
+    return CryptoScraper(session=fake_session)
+
+def test_fetch_prices_one_request(crypto_scraper, fake_session):
+    #names and symbols of the same coin share one ID, and every ID goes in one request
+    results = crypto_scraper.fetch_prices(['btc', 'bitcoin', 'eth'])
+
+    assert fake_session.get.call_count == 1
+    assert "ids=bitcoin,ethereum&" in fake_session.get.call_args.args[0]
+    assert results['btc'] == results['bitcoin']
+    assert results['btc']['price_usd'] == 67012.5
+    assert results['eth']['crypto_id'] == 'ETHEREUM'
+
+def test_fetch_prices_cached(crypto_scraper, fake_session):
+
+    crypto_scraper.fetch_prices(['bitcoin'])
+    results = crypto_scraper.fetch_prices(['bitcoin', 'eth'])
+
+    #bitcoin came from the cache, so only ethereum was asked for
+    assert fake_session.get.call_count == 2
+    assert "ids=ethereum&" in fake_session.get.call_args.args[0]
+    assert results['bitcoin']['success'] and results['eth']['success']
+
+    crypto_scraper.fetch_prices(['bitcoin', 'ethereum'])
+    assert fake_session.get.call_count == 2
+
+def test_fetch_prices_invalid_and_missing(crypto_scraper, fake_session):
+    #empty queries are rejected; a coin missing from the answer is reported, not cached
+    results = crypto_scraper.fetch_prices(['', 'doge', 'bitcoin'])
+
+    assert results[''] == {"error": "Invalid query", "success": False}
+    assert results['doge'] == {"error": "No data for dogecoin", "success": False}
+    assert results['bitcoin']['success']
+
+    crypto_scraper.fetch_prices(['doge'])
+    assert fake_session.get.call_count == 2
+
+def test_fetch_prices_request_error(crypto_scraper, fake_session):
+    #a failed request is an error for every query in it, and nothing is cached
+    fake_session.get.side_effect = requests.ConnectionError("offline")
+
+    results = crypto_scraper.fetch_prices(['bitcoin', 'eth'])
+
+    assert not results['bitcoin']['success']
+    assert results['bitcoin'] is results['eth']
+    assert len(crypto_scraper._cache) == 0
+
+@pytest.mark.parametrize("query,expected", [
+    ("ETH", "ethereum"),
+    ("what is the solana price", "solana"),
+    ("dogecoins", "dogecoin"), #plural of a known name
+    ("two ETHs", "ethereum"),
+    ("adapter", "bitcoin"), #'ada' only counts as a whole word
+    ("no coin here", "bitcoin"),
+])
+def test_resolve_id(crypto_scraper, query, expected):
+
+    assert crypto_scraper._resolve_id(query) == expected
+
+
+def test_cached_prices_are_copies(crypto_scraper):
+    #editing one caller's result must not change what later callers get
+    crypto_scraper.fetch("btc")["price_usd"] = "tampered"
+    results = crypto_scraper.fetch_prices(['btc', 'bitcoin'])
+    results['btc']['price_usd'] = "tampered"
+
+    assert crypto_scraper.fetch("bitcoin")["price_usd"] == 67012.5
+    assert crypto_scraper.fetch_prices(['btc'])['btc']['price_usd'] == 67012.5
+    assert results['bitcoin']['price_usd'] == 67012.5
+
+def test_cached_wikipedia_summary_is_a_copy(fake_session):
+    fake_session.get.return_value = fake_response(json.dumps({"title": "Quantum", "extract": "Physics"}).encode())
+    scraper = GeneralScraper(session=fake_session)
+
+    scraper.fetch("zzz quantum topic")["title"] = "tampered"
+
+    assert scraper.fetch("zzz quantum topic")["title"] == "Quantum"
+    assert fake_session.get.call_count == 1
+
+
+#CACHE TESTS
+def test_ttl_cache_expires_and_evicts():
+    cache = TTLCache(default_ttl=60, max_size=2)
+
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=0)
+    assert cache.get('a') == 1
+    assert cache.get('b', 'gone') == 'gone' #expired at once
+
+    cache.set('c', 3)
+    cache.set('d', 4) #full: 'a' is the oldest and is evicted
+    assert cache.get('a') is None
+    assert (cache.get('c'), cache.get('d')) == (3, 4)
+
+
+#HEADER TESTS
+def test_headers_are_per_scraper(fake_session):
+    scraper = EchoScraper(session=build_session())
+
+    scraper.headers['User-Agent'] = 'custom'
+
+    assert DEFAULT_HEADERS['User-Agent'] != 'custom'
+    assert EchoScraper(session=fake_session).headers['User-Agent'] != 'custom'
+    assert scraper._request_headers()['User-Agent'] == 'custom' #edited, so sent per request
+
+def test_request_headers_only_when_session_lacks_them():
+    #our sessions already send the defaults
+    assert EchoScraper(session=build_session())._request_headers() is None
+    assert EchoScraper(session=build_session())._request_headers({'If-None-Match': '"v1"'}) == {'If-None-Match': '"v1"'}
+
+    #a plain session from the caller gets them on every request
+    headers = EchoScraper(session=requests.Session())._request_headers({'If-None-Match': '"v1"'})
+    assert headers['Accept'] == 'application/json'
+    assert headers['If-None-Match'] == '"v1"'
+
+
+#NEWS TESTS
+#NewsAPI /everything answer with one article
+NEWS_BODY = json.dumps({
+    "status": "ok",
+    "articles": [{
+        "title": "Bitcoin climbs",
+        "description": "Prices rose today",
+        "content": None, #NewsAPI sends null for missing content
+        "source": {"name": "Example News"},
+        "author": "A. Writer",
+        "url": "https://example.com/bitcoin",
+        "publishedAt": "2024-02-16T12:00:00Z",
+        "urlToImage": None
+    }]
+}).encode()
+
+@pytest.fixture
+def news_scraper(fake_session):
+    fake_session.get.return_value = fake_response(NEWS_BODY, headers={"ETag": '"v1"'})
+    scraper = NewsScraper(session=fake_session)
+    scraper.api_key = "test-key"
+    return scraper
+
+def test_news_fetch_cached(news_scraper, fake_session):
+
+    first = news_scraper.fetch("Bitcoin")
+    second = news_scraper.fetch(" bitcoin ") #same cache key
+
+    assert fake_session.get.call_count == 1
+    assert second == first
+    assert second["articles"][0] is not first["articles"][0] #fresh dicts each time
+    assert first["articles"][0]["title"] == "Bitcoin climbs"
+
+def test_news_revalidates_with_etag(news_scraper, fake_session):
+
+    first = news_scraper.fetch("bitcoin")
+    assert "If-None-Match" not in fake_session.get.call_args.kwargs["headers"] #nothing to revalidate yet
+
+    #once the result cache expires, the stored ETag is sent and a 304 reuses the old articles
+    news_scraper._cache.clear()
+    fake_session.get.return_value = fake_response(b"", status_code=304)
+    second = news_scraper.fetch("bitcoin")
+
+    assert fake_session.get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert second["articles"] == first["articles"]
+    second["articles"][0]["title"] = "changed"
+    assert news_scraper.fetch("bitcoin")["articles"][0]["title"] == "Bitcoin climbs"
+    assert fake_session.get.call_count == 2 #the 304 refilled the result cache
+
+def test_news_failures_not_cached(news_scraper, fake_session):
+
+    fake_session.get.return_value = fake_response(json.dumps({"status": "error", "message": "rate limited"}).encode())
+    assert not news_scraper.fetch("bitcoin")["success"]
+
+    fake_session.get.side_effect = requests.ConnectionError("offline")
+    assert not news_scraper.fetch("bitcoin")["success"]
+
+    fake_session.get.side_effect = None
+    fake_session.get.return_value = fake_response(NEWS_BODY)
+    assert news_scraper.fetch("bitcoin")["success"]
+    assert fake_session.get.call_count == 3
+    assert len(news_scraper._etags) == 0 #no ETag in that answer
+
+def test_news_summary_word_counts_survive_eviction(fake_session):
+    #parse_data runs on several threads at once (fetch_multiple_queries); once the store
+    #is full, the words counted must still be those of the articles kept
+    scraper = NewsScraper(session=fake_session)
+    scraper.articles = deque(maxlen=50)
+
+    def batch(words):
+        article = {"title": "t", "url": "https://example.com", "description": "word " * words, "content": None}
+        return fake_response(json.dumps({"status": "ok", "articles": [article] * 40}).encode())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(scraper.parse_data, [batch(words) for words in range(1, 25)]))
+
+    summary = scraper.get_summary()
+    assert summary["total_articles"] == 50
+    assert summary["total_words"] == sum(len(a["description"].split()) for a in summary["articles"])
+    assert "word_count" not in summary["articles"][0]